@@ -0,0 +1,109 @@
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+def setup_env() -> None:
+    # Benchmarks run without a .env; fill in the required settings so
+    # blog_project.core.config can load.
+    defaults = {
+        "SECRET_KEY": "benchmark-secret-key-not-for-production-use",
+        "POSTGRES_USER": "postgres",
+        "POSTGRES_PASSWORD": "password123",
+        "POSTGRES_SERVER": "localhost",
+        "POSTGRES_DB": "blog_db",
+    }
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+    if SRC_DIR not in sys.path:
+        sys.path.insert(0, SRC_DIR)
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+async def seed_database(url: str, posts: int = 1000, users: int = 0, password_hash: str = "x", reset: bool = False):
+    # Fresh schema with one author ("author@example.com") plus `users` extra
+    # accounts (user{i}@example.com), and `posts` rows spread over all of
+    # them. Works for SQLite and Postgres URLs; returns the engine. A database
+    # that already has tables is only dropped with reset=True, which the
+    # scripts pass for their own temp files and for an explicit --reset.
+    from sqlalchemy import insert, inspect, text
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from blog_project.db.base import Base
+    from blog_project.db.search import ensure_search_index
+    from blog_project.models.models import Post, User, UserRole
+
+    if reset and url.startswith("sqlite"):
+        path = url.split(":///", 1)[1]
+        if os.path.exists(path):
+            os.remove(path)
+    engine = create_async_engine(url)
+    async with engine.connect() as conn:
+        tables = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names())
+    if tables and not reset:
+        await engine.dispose()
+        raise SystemExit(
+            f"{engine.url.render_as_string(hide_password=True)} already has tables; "
+            "pass --reset to drop them and reseed"
+        )
+    if url.startswith("sqlite"):
+        # WAL persists in the file, so servers started on it let readers run
+        # alongside the (single) writer
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    async with engine.begin() as conn:
+        if reset:
+            await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await ensure_search_index(conn)
+        emails = ["author@example.com"] + [f"user{i}@example.com" for i in range(users)]
+        await conn.execute(insert(User), [
+            {"email": email, "password_hash": password_hash, "is_active": True, "role": UserRole.USER}
+            for email in emails
+        ])
+        if posts:
+            await conn.execute(insert(Post), [
+                {"title": f"Post {i}", "content": "Lorem ipsum " * 40, "published": True, "author_id": 1 + i % len(emails)}
+                for i in range(posts)
+            ])
+            if url.startswith("sqlite"):
+                await conn.execute(text(
+                    "INSERT INTO posts_fts (rowid, title, content) SELECT id, title, content FROM posts"
+                ))
+    return engine
+
+async def seed_sqlite(path: str, posts: int = 1000):
+    # Fresh SQLite database with one author and `posts` rows at a temp path
+    # the script owns; returns a sessionmaker bound to it.
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    engine = await seed_database(f"sqlite+aiosqlite:///{path}", posts, reset=True)
+    return async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
+async def drive(app, paths, requests: int, concurrency: int):
+    # Issue `requests` GETs spread over `paths` through an in-process ASGI
+    # transport; returns (req/s, per-request latencies in ms).
+    import time
+    import httpx
+
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        counter = iter(range(requests))
+
+        async def worker():
+            for i in counter:
+                start = time.perf_counter()
+                response = await client.get(paths[i % len(paths)])
+                latencies.append((time.perf_counter() - start) * 1000)
+                assert response.status_code < 500, response.text
+
+        import asyncio
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return requests / elapsed, latencies
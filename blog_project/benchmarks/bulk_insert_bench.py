@@ -0,0 +1,74 @@
+"""Rows/second for POST /api/v1/posts/ one at a time versus POST /bulk.
+
+    python benchmarks/bulk_insert_bench.py [--rows 2000] [--batch 500]
+
+Runs in-process against a seeded SQLite database with authentication
+stubbed out, which favours the single-post path (it normally also pays for
+token checks on every row).
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from _common import seed_sqlite, setup_env
+
+setup_env()
+
+import httpx
+from fastapi import FastAPI
+
+from blog_project.api import routes
+from blog_project.core.deps import get_current_active_user
+from blog_project.db.session import get_db
+from blog_project.models.models import User, UserRole
+
+def build_app(session_factory) -> FastAPI:
+    app = FastAPI()
+
+    async def get_bench_db():
+        async with session_factory() as session:
+            yield session
+
+    async def get_bench_user():
+        return User(id=1, email="author@example.com", role=UserRole.USER, is_active=True)
+
+    app.include_router(routes.router, prefix="/api/v1/posts")
+    app.dependency_overrides[get_db] = get_bench_db
+    app.dependency_overrides[get_current_active_user] = get_bench_user
+    return app
+
+def make_posts(count: int):
+    return [{"title": f"Imported {i}", "content": "Lorem ipsum " * 40, "published": True} for i in range(count)]
+
+async def main(rows: int, batch: int) -> None:
+    session_factory = await seed_sqlite(os.path.join(tempfile.mkdtemp(), "bench.db"), posts=0)
+    app = build_app(session_factory)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        posts = make_posts(rows)
+
+        start = time.perf_counter()
+        for post in posts:
+            response = await client.post("/api/v1/posts/", json=post)
+            assert response.status_code == 201, response.text
+        single = rows / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for offset in range(0, rows, batch):
+            response = await client.post("/api/v1/posts/bulk", json=posts[offset:offset + batch])
+            assert response.status_code == 200 and not response.json()["errors"], response.text
+        bulk = rows / (time.perf_counter() - start)
+
+    print(f"{'path':<8} {'rows/s':>10}")
+    print(f"{'single':<8} {single:>10.0f}")
+    print(f"{'bulk':<8} {bulk:>10.0f}")
+    print(f"speedup  {bulk / single:>9.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.batch))
@@ -0,0 +1,74 @@
+"""CPU spent compressing list pages vs bandwidth saved.
+
+    python benchmarks/compression_bench.py [--rounds 20]
+
+Builds post list pages of several sizes (random words, so they compress like
+real text rather than repeated filler) and, for every available coding and
+a few levels, reports compression time, ratio, throughput, and the transfer
+time saved on a 10 and a 100 Mbit/s link. A coding pays off while the
+transfer time it saves exceeds the CPU it costs; with the response cache the
+CPU is paid once per cached entry rather than per request.
+"""
+import argparse
+import gzip
+import random
+import time
+from datetime import datetime
+
+import brotli
+import zstandard
+
+from _common import setup_env
+
+setup_env()
+
+from blog_project.schemas.schemas import post_page_adapter
+
+def make_page(posts: int, rng: random.Random) -> bytes:
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 10))) for _ in range(2000)]
+    data = [
+        {
+            "title": " ".join(rng.choices(words, k=6)),
+            "content": " ".join(rng.choices(words, k=rng.randint(50, 400))),
+            "published": True,
+            "id": i,
+            "created_at": datetime(2025, 1, 1, 12, 0, i % 60),
+            "author_id": 1 + i % 50,
+        }
+        for i in range(posts)
+    ]
+    page = {"total": 100000, "skip": 0, "limit": posts, "next_cursor": None, "prev_cursor": None, "data": data}
+    return post_page_adapter.dump_json(page)
+
+def codecs():
+    yield "gzip-1", lambda body: gzip.compress(body, compresslevel=1, mtime=0)
+    yield "gzip-6", lambda body: gzip.compress(body, compresslevel=6, mtime=0)
+    yield "gzip-9", lambda body: gzip.compress(body, compresslevel=9, mtime=0)
+    for quality in (1, 4, 11):
+        yield f"br-{quality}", lambda body, q=quality: brotli.compress(body, quality=q)
+    for level in (1, 3, 10):
+        yield f"zstd-{level}", lambda body, l=level: zstandard.ZstdCompressor(level=l).compress(body)
+
+def run(rounds: int) -> None:
+    rng = random.Random(1)
+    for posts in (5, 50, 500):
+        body = make_page(posts, rng)
+        print(f"page of {posts} posts: {len(body) / 1024:.1f} KB")
+        print(f"{'coding':<8} {'ms':>8} {'ratio':>6} {'MB/s':>7} {'saved @10Mbit ms':>17} {'saved @100Mbit ms':>18}")
+        for name, encoder in codecs():
+            start = time.perf_counter()
+            for _ in range(rounds):
+                compressed = encoder(body)
+            seconds = (time.perf_counter() - start) / rounds
+            saved_bits = (len(body) - len(compressed)) * 8
+            print(
+                f"{name:<8} {seconds * 1000:>8.3f} {len(body) / len(compressed):>6.1f} "
+                f"{len(body) / seconds / 1e6:>7.0f} {saved_bits / 10e6 * 1000:>17.2f} {saved_bits / 100e6 * 1000:>18.2f}"
+            )
+        print()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    run(args.rounds)
@@ -0,0 +1,356 @@
+"""Mixed-workload load test against a real uvicorn server.
+
+    python benchmarks/load.py [--posts 5000] [--concurrency 16] [--duration 20]
+                              [--database-url URL [--reset]] [--workers 1]
+                              [--output results.json] [--baseline benchmarks/baselines/load-sqlite.json]
+
+Seeds a fresh database (SQLite via aiosqlite by default, or any URL given with
+--database-url, e.g. a local postgresql+asyncpg://... instance; one that
+already has tables is only dropped with --reset), starts the app
+with uvicorn in a subprocess and runs `concurrency` virtual users for
+`duration` seconds after a warmup. Each virtual user logs in as its own seeded
+account and picks operations by weight: post listings at several offsets and
+cursor depths, single posts, search, creating and updating its own posts,
+logins and admin listings. Pass --url to target an already running server
+instead (no seeding; the seeded accounts must exist there).
+
+Results are printed per operation (req/s, p50/p90/p99 in ms, errors) and
+written as JSON with --output. With --baseline, p50/p99 increases or a total
+req/s drop beyond --tolerance, and any new errors, are reported and the exit
+status is 1, so the script can gate CI. Compare numbers from the same machine
+only; benchmarks/baselines/ holds reference runs.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from _common import SRC_DIR, percentile, setup_env
+
+setup_env()
+
+import httpx
+
+API = "/api/v1"
+ADMIN_EMAIL = "admin@example.com"
+ADMIN_PASSWORD = "Admin@123456"
+USER_PASSWORD = "Bench@123456"
+PAGE_SIZE = 20
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, email: str, posts: int, depths, rng: random.Random):
+        self.client = client
+        self.email = email
+        self.posts = posts
+        self.depths = depths
+        self.rng = rng
+        self.headers = {}
+        self.own_posts = []
+        self.cursor = None
+
+    async def login(self):
+        response = await self.client.post(f"{API}/auth/login", data={"username": self.email, "password": USER_PASSWORD})
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return response
+
+    async def read_first_page(self):
+        return await self.client.get(f"{API}/posts/", params={"limit": PAGE_SIZE})
+
+    async def read_offset_page(self):
+        skip = self.rng.choice(self.depths)
+        return await self.client.get(f"{API}/posts/", params={"skip": skip, "limit": PAGE_SIZE})
+
+    async def read_cursor_page(self):
+        # Walks towards older posts, restarting from the front page at the end
+        params = {"limit": PAGE_SIZE}
+        if self.cursor:
+            params["cursor"] = self.cursor
+        response = await self.client.get(f"{API}/posts/", params=params)
+        if response.status_code == 200:
+            self.cursor = response.json()["next_cursor"]
+        return response
+
+    async def get_post(self):
+        return await self.client.get(f"{API}/posts/{self.rng.randint(1, self.posts)}")
+
+    async def search(self):
+        return await self.client.get(f"{API}/posts/search", params={"q": f"post {self.rng.randint(1, self.posts)}"})
+
+    async def create_post(self):
+        response = await self.client.post(
+            f"{API}/posts/",
+            json={"title": f"Load test post {self.rng.random()}", "content": "Lorem ipsum " * 40},
+            headers=self.headers
+        )
+        if response.status_code == 201:
+            self.own_posts.append(response.json()["id"])
+        return response
+
+    async def update_post(self):
+        if not self.own_posts:
+            return await self.create_post()
+        post_id = self.rng.choice(self.own_posts)
+        return await self.client.put(
+            f"{API}/posts/{post_id}",
+            json={"title": f"Updated {self.rng.random()}", "content": "Dolor sit amet " * 40},
+            headers=self.headers
+        )
+
+class Admin:
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.headers = {}
+
+    async def login(self):
+        response = await self.client.post(f"{API}/auth/login", data={"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def list_users(self):
+        return await self.client.get(f"{API}/admin/users", headers=self.headers)
+
+    async def list_posts(self):
+        return await self.client.get(f"{API}/admin/posts", headers=self.headers)
+
+# Operation name -> (weight, method name, runs as admin)
+WORKLOAD = {
+    "read_posts first page": (25, "read_first_page", False),
+    "read_posts offset": (10, "read_offset_page", False),
+    "read_posts cursor": (15, "read_cursor_page", False),
+    "get_post": (25, "get_post", False),
+    "search": (8, "search", False),
+    "create_post": (6, "create_post", False),
+    "update_post": (6, "update_post", False),
+    "login": (2, "login", False),
+    "admin list_users": (1, "list_users", True),
+    "admin list_posts": (1, "list_posts", True),
+}
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def seed(database_url: str, posts: int, users: int, reset: bool) -> None:
+    from _common import seed_database
+    from blog_project.core.security import get_password_hash
+
+    engine = await seed_database(
+        database_url, posts, users, password_hash=get_password_hash(USER_PASSWORD), reset=reset
+    )
+    await engine.dispose()
+
+def start_server(database_url: str, port: int, workers: int, log_path: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join(filter(None, [SRC_DIR, os.environ.get("PYTHONPATH")])),
+        DATABASE_URL_OVERRIDE=database_url,
+        ADMIN_EMAIL=ADMIN_EMAIL,
+        ADMIN_PASSWORD=ADMIN_PASSWORD,
+        # The load comes from a single IP
+        RATE_LIMIT_ENABLED="false",
+    )
+    log = open(log_path, "w")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "blog_project.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--no-access-log"],
+        env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+
+async def wait_ready(base_url: str, server: subprocess.Popen, log_path: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            if server and server.poll() is not None:
+                break
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise SystemExit(f"Server did not become ready; see {log_path}")
+
+async def run_load(base_url: str, posts: int, users: int, concurrency: int, duration: float, warmup: float, seed_value: int):
+    rng = random.Random(seed_value)
+    depths = sorted({0, min(100, posts), posts // 2, max(0, posts - PAGE_SIZE)})
+    names = list(WORKLOAD)
+    weights = [WORKLOAD[name][0] for name in names]
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        admin = Admin(client)
+        await admin.login()
+        virtual_users = [
+            VirtualUser(client, f"user{i % users}@example.com", posts, depths, random.Random(rng.random()))
+            for i in range(concurrency)
+        ]
+        await asyncio.gather(*(user.login() for user in virtual_users))
+
+        start = time.perf_counter()
+        measure_from = start + warmup
+        stop_at = measure_from + duration
+
+        async def worker(user: VirtualUser):
+            while True:
+                name = user.rng.choices(names, weights)[0]
+                _, method, as_admin = WORKLOAD[name]
+                target = admin if as_admin else user
+                began = time.perf_counter()
+                if began >= stop_at:
+                    return
+                try:
+                    response = await getattr(target, method)()
+                    failed = response.status_code >= 400
+                except httpx.HTTPError:
+                    failed = True
+                if began >= measure_from:
+                    samples[name].append((time.perf_counter() - began) * 1000)
+                    if failed:
+                        errors[name] += 1
+
+        await asyncio.gather(*(worker(user) for user in virtual_users))
+        elapsed = time.perf_counter() - measure_from
+
+    endpoints = {}
+    for name in names:
+        latencies = samples.get(name, [])
+        endpoints[name] = {
+            "requests": len(latencies),
+            "errors": errors.get(name, 0),
+            "rps": round(len(latencies) / elapsed, 2),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p90_ms": round(percentile(latencies, 90), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        }
+    total_requests = sum(data["requests"] for data in endpoints.values())
+    total = {
+        "requests": total_requests,
+        "errors": sum(data["errors"] for data in endpoints.values()),
+        "rps": round(total_requests / elapsed, 2),
+        "p50_ms": round(percentile([v for values in samples.values() for v in values], 50), 2),
+        "p99_ms": round(percentile([v for values in samples.values() for v in values], 99), 2),
+    }
+    return total, endpoints
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SRC_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def print_results(total: dict, endpoints: dict) -> None:
+    print(f"{'operation':<24} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name, data in endpoints.items():
+        print(f"{name:<24} {data['rps']:>8.1f} {data['p50_ms']:>8.1f} {data['p90_ms']:>8.1f} "
+              f"{data['p99_ms']:>8.1f} {data['errors']:>7}")
+    print(f"{'total':<24} {total['rps']:>8.1f} {total['p50_ms']:>8.1f} {'':>8} "
+          f"{total['p99_ms']:>8.1f} {total['errors']:>7}")
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    # Returns human-readable regressions; operations missing on either side
+    # are skipped so the workload can grow without invalidating old baselines.
+    regressions = []
+    rows = [("total", results["total"], baseline["total"])] + [
+        (name, data, baseline["endpoints"][name])
+        for name, data in results["endpoints"].items()
+        if name in baseline["endpoints"]
+    ]
+    for name, current, previous in rows:
+        for metric in ("p50_ms", "p99_ms"):
+            if previous[metric] and current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {previous[metric]} -> {current[metric]}")
+        # Per-operation rates just follow the workload mix; compare throughput once
+        if name == "total" and current["rps"] < previous["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {previous['rps']} -> {current['rps']}")
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}: errors {previous['errors']} -> {current['errors']}")
+    return regressions
+
+async def main(args) -> int:
+    server = None
+    log_path = os.path.join(tempfile.gettempdir(), "blog_project_load_server.log")
+    database_url = args.database_url or "sqlite+aiosqlite:///" + os.path.join(tempfile.gettempdir(), "blog_project_load.db")
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        # The default temp file is ours to replace; a given URL needs --reset
+        await seed(database_url, args.posts, args.users, args.reset or not args.database_url)
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = start_server(database_url, port, args.workers, log_path)
+    try:
+        await wait_ready(base_url, server, log_path)
+        total, endpoints = await run_load(
+            base_url, args.posts, args.users, args.concurrency, args.duration, args.warmup, args.seed
+        )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "database": "external" if args.url else database_url.split(":", 1)[0],
+            "posts": args.posts,
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "duration": args.duration,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "total": total,
+        "endpoints": endpoints,
+    }
+    print_results(total, endpoints)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions against {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default="", help="SQLAlchemy URL to seed and serve (default: temp SQLite file)")
+    parser.add_argument("--reset", action="store_true", help="Drop and reseed --database-url if it already has tables")
+    parser.add_argument("--url", default="", help="Base URL of an already running server; skips seeding")
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="")
+    parser.add_argument("--baseline", default="")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    sys.exit(asyncio.run(main(parser.parse_args())))
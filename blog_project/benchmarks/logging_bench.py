@@ -0,0 +1,88 @@
+"""Time an info log line costs the calling thread (the event loop in the app).
+
+    python benchmarks/logging_bench.py [--records 20000] [--stall-us 200]
+
+Compares the old basicConfig-style StreamHandler (f-string message, one write
+per line as with PYTHONUNBUFFERED) against the queue handler with %-style
+arguments, with and without 10% sampling. Runs once against a fast sink and
+once against a sink that stalls on every write, as stdout does when the log
+collector falls behind. In the stalled case the queue fills up and drops
+records instead of slowing the caller down.
+"""
+import argparse
+import logging
+import queue
+import time
+
+from _common import setup_env
+
+setup_env()
+
+from blog_project.core.logging_config import (
+    TEXT_FORMAT,
+    DroppingQueueHandler,
+    JsonFormatter,
+    LogListener,
+    SamplingFilter
+)
+
+class Sink:
+    def __init__(self, stall: float):
+        self.stall = stall
+
+    def write(self, text: str) -> None:
+        if self.stall:
+            time.sleep(self.stall)
+
+    def flush(self) -> None:
+        pass
+
+def fresh_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"bench.{name}")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+def time_calls(logger: logging.Logger, records: int, use_fstring: bool) -> float:
+    email = "user@example.com"
+    start = time.perf_counter()
+    if use_fstring:
+        for i in range(records):
+            logger.info(f"User {email} creating post {i}")
+    else:
+        for i in range(records):
+            logger.info("User %s creating post %s", email, i)
+    return (time.perf_counter() - start) / records
+
+def run(records: int, stall: float) -> None:
+    stream = logging.StreamHandler(Sink(stall))
+    stream.setFormatter(logging.Formatter(TEXT_FORMAT))
+    results = {"sync stream, f-string": (time_calls(fresh_logger("sync", stream), records, True), 0)}
+
+    for name, rate in (("queue + json", None), ("queue + json, 10% sampled", 0.1)):
+        writer = logging.StreamHandler(Sink(stall))
+        writer.setFormatter(JsonFormatter())
+        handler = DroppingQueueHandler(queue.Queue(maxsize=10000))
+        if rate is not None:
+            handler.addFilter(SamplingFilter({"bench": rate}))
+        listener = LogListener(handler.queue, writer)
+        listener.start()
+        seconds = time_calls(fresh_logger(name, handler), records, False)
+        listener.stop()
+        results[name] = (seconds, handler.dropped_total)
+
+    baseline = results["sync stream, f-string"][0]
+    print(f"sink stall {stall * 1e6:.0f} us/write, {records} records")
+    print(f"{'variant':<28} {'us/call':>8} {'speedup':>8} {'dropped':>8}")
+    for name, (seconds, dropped) in results.items():
+        print(f"{name:<28} {seconds * 1e6:>8.2f} {baseline / seconds:>7.1f}x {dropped:>8}")
+    print()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--stall-us", type=float, default=200)
+    args = parser.parse_args()
+    run(args.records, 0)
+    run(args.records, args.stall_us / 1e6)
@@ -0,0 +1,49 @@
+"""Overhead of MetricsMiddleware on the /health endpoint.
+
+    python benchmarks/metrics_bench.py [--requests 20000] [--concurrency 32] [--rounds 5]
+
+Runs both variants in alternating rounds and keeps the best req/s of each,
+which smooths out scheduler noise. Target: under 2% overhead.
+"""
+import argparse
+import asyncio
+
+from _common import drive, setup_env
+
+setup_env()
+
+from fastapi import FastAPI
+
+from blog_project.core.metrics import MetricsMiddleware, MetricsRegistry
+
+def build_app(with_metrics: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health_check():
+        return {"status": "healthy"}
+
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware, registry=MetricsRegistry())
+    return app
+
+async def main(requests: int, concurrency: int, rounds: int) -> None:
+    apps = {"baseline": build_app(False), "metrics": build_app(True)}
+    best = {name: 0.0 for name in apps}
+    for _ in range(rounds):
+        for name, app in apps.items():
+            rps, _ = await drive(app, ["/health"], requests, concurrency)
+            best[name] = max(best[name], rps)
+    overhead = (best["baseline"] - best["metrics"]) / best["baseline"] * 100
+    print(f"{'variant':<10} {'req/s':>10}")
+    for name, rps in best.items():
+        print(f"{name:<10} {rps:>10.0f}")
+    print(f"overhead   {overhead:>9.2f}%")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.rounds))
@@ -0,0 +1,70 @@
+"""Per-request cost of the rate limiter backends as the client count grows.
+
+    python benchmarks/rate_limit_bench.py [--hits 200000]
+
+A flat ns/hit column across client counts means the cost is O(1) in both
+the number of tracked clients and the requests inside a window.
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from _common import setup_env
+
+setup_env()
+
+from blog_project.core.rate_limit import MemoryBackend, SharedMemoryBackend
+
+CLIENT_COUNTS = (1_000, 10_000, 100_000)
+
+class LegacyListBackend:
+    # The previous list-of-datetimes implementation, kept for comparison
+    def __init__(self, requests: int = 100, window: int = 60):
+        self.requests = requests
+        self.window = window
+        self.clients = defaultdict(list)
+
+    async def hit(self, key, limit, window, now):
+        current = datetime.now()
+        self.clients[key] = [t for t in self.clients[key] if current - t < timedelta(seconds=self.window)]
+        if len(self.clients[key]) >= self.requests:
+            return False, 1
+        self.clients[key].append(current)
+        return True, 0
+
+async def run(backend, clients: int, hits: int) -> float:
+    keys = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(clients)]
+    # Warm every client so the backend is at full size before timing
+    for key in keys:
+        await backend.hit(key, 1_000_000, 60, time.time())
+    sample = [random.choice(keys) for _ in range(hits)]
+    now = time.time()
+    start = time.perf_counter()
+    for key in sample:
+        await backend.hit(key, 1_000_000, 60, now)
+    return (time.perf_counter() - start) / hits * 1e9
+
+async def main(hits: int) -> None:
+    print(f"{'backend':<10} {'clients':>9} {'ns/hit':>10}")
+    for clients in CLIENT_COUNTS:
+        backends = {
+            "memory": MemoryBackend(max_clients=clients),
+            "shared": SharedMemoryBackend(
+                os.path.join(tempfile.mkdtemp(), "rate_limit"), slots=clients * 2
+            ),
+            "legacy": LegacyListBackend(),
+        }
+        for name, backend in backends.items():
+            ns = await run(backend, clients, hits)
+            print(f"{name:<10} {clients:>9} {ns:>10.0f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hits", type=int, default=200_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.hits))
@@ -0,0 +1,79 @@
+"""Compare the pure-ASGI SecurityHeadersMiddleware with the previous
+BaseHTTPMiddleware implementation on /health and GET /posts/{id}.
+
+    python benchmarks/security_headers_bench.py [--requests 5000] [--concurrency 32]
+
+Both variants send the "strict" header set. Requests go through an
+in-process ASGI transport against a seeded SQLite database, so absolute
+numbers are lower than behind uvicorn, but the middleware cost is the same.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+
+from _common import drive, percentile, seed_sqlite, setup_env
+
+setup_env()
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from blog_project.api import routes
+from blog_project.core.security_headers import SECURITY_HEADER_PROFILES, SecurityHeadersMiddleware
+from blog_project.db.session import get_db
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        for name, value in SECURITY_HEADER_PROFILES["strict"].items():
+            response.headers[name] = value
+        return response
+
+def build_app(session_factory, middleware) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health_check():
+        return {"status": "healthy"}
+
+    async def get_bench_db():
+        async with session_factory() as session:
+            yield session
+
+    app.include_router(routes.router, prefix="/api/v1/posts")
+    app.dependency_overrides[get_db] = get_bench_db
+    if middleware is LegacySecurityHeadersMiddleware:
+        app.add_middleware(middleware)
+    elif middleware is SecurityHeadersMiddleware:
+        app.add_middleware(middleware, profile="strict")
+    return app
+
+async def main(requests: int, concurrency: int) -> None:
+    session_factory = await seed_sqlite(os.path.join(tempfile.mkdtemp(), "bench.db"), posts=200)
+    variants = {
+        "none": None,
+        "legacy": LegacySecurityHeadersMiddleware,
+        "asgi": SecurityHeadersMiddleware,
+    }
+    workloads = {
+        "/health": ["/health"],
+        "/posts/{id}": [f"/api/v1/posts/{i}" for i in range(1, 201)],
+    }
+    print(f"{'endpoint':<14} {'middleware':<10} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for endpoint, paths in workloads.items():
+        for name, middleware in variants.items():
+            app = build_app(session_factory, middleware)
+            await drive(app, paths, min(500, requests), concurrency)  # warm up
+            rps, latencies = await drive(app, paths, requests, concurrency)
+            print(
+                f"{endpoint:<14} {name:<10} {rps:>10.0f} "
+                f"{percentile(latencies, 50):>8.2f} {percentile(latencies, 99):>8.2f}"
+            )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,78 @@
+"""Serialization cost of one 100-item post list page.
+
+    python benchmarks/serialization_bench.py [--items 100] [--number 500]
+
+Compares the old path (ORM objects through jsonable_encoder and json.dumps),
+validating the page through the PostPage model, and the typed path used by
+read_posts (column rows dumped by a TypeAdapter). Also compares rendering a
+plain dict with JSONResponse and FastJSONResponse (orjson).
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta
+
+from _common import setup_env
+
+setup_env()
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from blog_project.core.responses import FastJSONResponse
+from blog_project.models.models import Post
+from blog_project.schemas.schemas import PostPage, post_page_adapter
+
+def build_rows(items: int) -> list:
+    now = datetime(2024, 1, 1, 12, 0, 0, 123456)
+    return [
+        {
+            "title": f"Post number {i} — benchmark",
+            "content": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8,
+            "published": True,
+            "id": i,
+            "created_at": now - timedelta(minutes=i),
+            "author_id": 1 + i % 7,
+        }
+        for i in range(items, 0, -1)
+    ]
+
+def page(data: list) -> dict:
+    return {"total": 10_000, "skip": 0, "limit": len(data), "next_cursor": "WyIyMDI0Il0", "prev_cursor": None, "data": data}
+
+def main(items: int, number: int) -> None:
+    rows = build_rows(items)
+    orm_posts = [Post(**row) for row in rows]
+    jsonable_page = jsonable_encoder(page(rows))
+
+    page_variants = {
+        "jsonable_encoder + json": lambda: json.dumps(
+            jsonable_encoder(page(orm_posts)), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8"),
+        "PostPage model": lambda: PostPage.model_validate(
+            page(orm_posts), from_attributes=True
+        ).model_dump_json().encode("utf-8"),
+        "typed rows (TypeAdapter)": lambda: post_page_adapter.dump_json(page(rows)),
+    }
+    render_variants = {
+        "JSONResponse.render": lambda: JSONResponse.render(None, jsonable_page),
+        "FastJSONResponse.render": lambda: FastJSONResponse.render(None, jsonable_page),
+    }
+    assert json.loads(page_variants["typed rows (TypeAdapter)"]()) == json.loads(page_variants["jsonable_encoder + json"]())
+
+    print(f"{items}-item page")
+    print(f"{'variant':<26} {'us/page':>10} {'speedup':>8}")
+    for variants in (page_variants, render_variants):
+        # Speedups are relative to the first variant of each group
+        baseline = None
+        for name, fn in variants.items():
+            seconds = min(timeit.repeat(fn, number=number, repeat=5)) / number
+            baseline = baseline or seconds
+            print(f"{name:<26} {seconds * 1e6:>10.1f} {baseline / seconds:>7.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args()
+    main(args.items, args.number)
@@ -0,0 +1,75 @@
+"""Worker start time: spawn uvicorn until every worker has finished startup.
+
+    python benchmarks/startup_bench.py [--workers 4] [--rounds 5] [--database-url URL]
+
+Runs against an already bootstrapped database (the usual restart/scale-out
+case), once with BOOTSTRAP_ON_STARTUP=true (schema checks and admin lookup in
+every worker) and once with it disabled (bootstrap ran beforehand). Reports
+the median time from spawning uvicorn until all workers logged
+"Application startup complete".
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from _common import SRC_DIR, seed_database, setup_env
+
+setup_env()
+
+from load import free_port
+
+def time_startup(database_url: str, workers: int, bootstrap: bool, log_path: str) -> float:
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join(filter(None, [SRC_DIR, os.environ.get("PYTHONPATH")])),
+        DATABASE_URL_OVERRIDE=database_url,
+        BOOTSTRAP_ON_STARTUP=str(bootstrap).lower(),
+    )
+    with open(log_path, "w") as log:
+        start = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "blog_project.main:app", "--host", "127.0.0.1",
+             "--port", str(free_port()), "--workers", str(workers)],
+            env=env, stdout=log, stderr=subprocess.STDOUT
+        )
+        try:
+            while True:
+                with open(log_path) as f:
+                    if f.read().count("Application startup complete") >= workers:
+                        return time.perf_counter() - start
+                if server.poll() is not None or time.perf_counter() - start > 60:
+                    raise SystemExit(f"Server failed to start; see {log_path}")
+                time.sleep(0.01)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+def main(database_url: str, workers: int, rounds: int) -> None:
+    log_path = os.path.join(tempfile.gettempdir(), "blog_project_startup.log")
+    if not database_url:
+        database_url = "sqlite+aiosqlite:///" + os.path.join(tempfile.gettempdir(), "blog_project_startup.db")
+        asyncio.run(seed_database(database_url, posts=100, reset=True))
+    # First boot creates the admin; every timed round is a restart
+    time_startup(database_url, 1, True, log_path)
+
+    results = {True: [], False: []}
+    for _ in range(rounds):
+        for bootstrap in results:
+            results[bootstrap].append(time_startup(database_url, workers, bootstrap, log_path))
+    print(f"{workers} worker(s), median of {rounds} rounds")
+    for bootstrap, samples in results.items():
+        label = "bootstrap in workers" if bootstrap else "bootstrap skipped"
+        print(f"{label:<22} {statistics.median(samples) * 1000:>8.0f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default="")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    main(args.database_url, args.workers, args.rounds)
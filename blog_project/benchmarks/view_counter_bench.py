@@ -0,0 +1,92 @@
+"""Cost of counting post views: upsert per request vs in-memory aggregation.
+
+    python benchmarks/view_counter_bench.py [--posts 1000] [--requests 5000] [--concurrency 16]
+
+Serves a minimal GET /posts/{id} from a seeded SQLite file in three variants:
+no counting, one upsert per view (what a naive counter does), and the
+ViewCounter used by the app (a dict increment per view plus one batched
+flush at the end). Reports req/s and how many write statements each variant
+issued; "lost" counts views whose write failed.
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+
+from _common import drive, seed_sqlite, setup_env
+
+setup_env()
+
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+from blog_project.core import view_counter as view_counter_module
+from blog_project.core.view_counter import ViewCounter, upsert_view_counts
+from blog_project.models.models import Post
+
+failures = {"no counting": 0, "upsert per view": 0, "aggregated": 0}
+
+def build_app(sessionmaker, mode: str, counter: ViewCounter) -> FastAPI:
+    app = FastAPI()
+
+    async def get_db():
+        async with sessionmaker() as session:
+            yield session
+
+    @app.get("/posts/{post_id}")
+    async def get_post(post_id: int, db=Depends(get_db)):
+        post = await db.get(Post, post_id)
+        if post is None:
+            raise HTTPException(status_code=404)
+        if mode == "upsert per view":
+            try:
+                await upsert_view_counts(db, {post_id: 1})
+                await db.commit()
+            except OperationalError:
+                # SQLite's single writer: concurrent upserts hit "database is locked"
+                await db.rollback()
+                failures[mode] += 1
+        elif mode == "aggregated":
+            counter.record(post_id)
+        return {"id": post.id, "title": post.title}
+
+    return app
+
+async def main(posts: int, requests: int, concurrency: int) -> None:
+    path = os.path.join(tempfile.gettempdir(), "blog_project_view_bench.db")
+    sessionmaker = await seed_sqlite(path, posts)
+    engine = sessionmaker.kw["bind"]
+    writes = 0
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_writes(conn, cursor, statement, parameters, context, executemany):
+        nonlocal writes
+        if statement.lstrip().upper().startswith("INSERT"):
+            writes += 1
+
+    rng = random.Random(1)
+    # Skewed towards a few hot posts, as real traffic is
+    paths = [f"/posts/{min(posts, int(rng.paretovariate(1.2)))}" for _ in range(requests)]
+
+    # ViewCounter.flush opens its session from AsyncSessionLocal; point it here
+    view_counter_module.AsyncSessionLocal = sessionmaker
+
+    print(f"{'variant':<18} {'req/s':>8} {'writes':>8} {'lost':>6}")
+    for mode in ("no counting", "upsert per view", "aggregated"):
+        counter = ViewCounter()
+        writes = 0
+        rps, _ = await drive(build_app(sessionmaker, mode, counter), paths, requests, concurrency)
+        await counter.flush()
+        print(f"{mode:<18} {rps:>8.0f} {writes:>8} {failures[mode]:>6}")
+
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(main(args.posts, args.requests, args.concurrency))
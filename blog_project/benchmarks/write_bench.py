@@ -0,0 +1,128 @@
+"""Write latency: select-then-write vs single conditional statements.
+
+    python benchmarks/write_bench.py [--ops 2000] [--concurrency 8] [--database-url URL [--reset]]
+
+Runs post updates, post deletes and user signups through the old handler
+logic (SELECT, check in Python, write, commit, refresh) and through
+blog_project.db.crud (one UPDATE/DELETE/INSERT ... RETURNING), each
+operation in its own session as in a request. Reports p50/p99 and SQL
+statements per operation. On SQLite the database is in-process, so the
+saved round trips show mostly as fewer statements; against Postgres
+(--database-url) each one is a network round trip under the pool. A
+--database-url that already has tables is only dropped with --reset.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from _common import percentile, seed_database, setup_env
+
+setup_env()
+
+from fastapi import HTTPException
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from blog_project.db import crud, search
+from blog_project.models.models import Post, User, UserRole
+
+AUTHOR_ID = 1
+
+async def old_update(db, post_id):
+    post = (await db.execute(select(Post).where(Post.id == post_id))).scalar_one_or_none()
+    if post is None:
+        raise HTTPException(status_code=404)
+    if post.author_id != AUTHOR_ID:
+        raise HTTPException(status_code=403)
+    post.title = f"Updated {post_id}"
+    await search.index_post(db, post)
+    await db.commit()
+    await db.refresh(post)
+
+async def new_update(db, post_id):
+    await crud.update_own_post(db, post_id, AUTHOR_ID, f"Updated {post_id}", "Lorem ipsum", True)
+    await db.commit()
+
+async def old_delete(db, post_id):
+    post = (await db.execute(select(Post).where(Post.id == post_id))).scalar_one_or_none()
+    if post is None:
+        raise HTTPException(status_code=404)
+    if post.author_id != AUTHOR_ID:
+        raise HTTPException(status_code=403)
+    await search.remove_posts(db, [post_id])
+    await db.delete(post)
+    await db.commit()
+
+async def new_delete(db, post_id):
+    await crud.delete_own_post(db, post_id, AUTHOR_ID)
+    await db.commit()
+
+async def old_signup(db, i):
+    email = f"old{i}@example.com"
+    if (await db.execute(select(User).where(User.email == email))).scalar_one_or_none():
+        raise HTTPException(status_code=400)
+    user = User(email=email, password_hash="x", is_active=True, role=UserRole.USER)
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+
+async def new_signup(db, i):
+    if await crud.create_user(db, f"new{i}@example.com", "x", UserRole.USER) is None:
+        raise HTTPException(status_code=400)
+    await db.commit()
+
+async def run(sessionmaker, operation, args, concurrency):
+    latencies = []
+    work = iter(args)
+
+    async def worker():
+        for arg in work:
+            start = time.perf_counter()
+            async with sessionmaker() as db:
+                await operation(db, arg)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+async def main(ops: int, concurrency: int, database_url: str, reset: bool) -> None:
+    if not database_url:
+        database_url = "sqlite+aiosqlite:///" + os.path.join(tempfile.gettempdir(), "blog_project_write_bench.db")
+        reset = True
+    # Posts 1..2*ops all belong to the author; each half is deleted by one variant
+    engine = await seed_database(database_url, posts=2 * ops, reset=reset)
+    sessionmaker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    statements = 0
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        nonlocal statements
+        statements += 1
+
+    cases = [
+        ("update post", old_update, new_update, range(1, ops + 1), range(1, ops + 1)),
+        ("delete post", old_delete, new_delete, range(1, ops + 1), range(ops + 1, 2 * ops + 1)),
+        ("create user", old_signup, new_signup, range(ops), range(ops)),
+    ]
+    print(f"{ops} ops per variant, concurrency {concurrency}, {engine.dialect.name}")
+    print(f"{'operation':<12} {'variant':<22} {'p50 ms':>8} {'p99 ms':>8} {'stmts/op':>9}")
+    for name, old, new, old_args, new_args in cases:
+        for variant, operation, args in (("select + write", old, old_args), ("single statement", new, new_args)):
+            statements = 0
+            latencies = await run(sessionmaker, operation, args, concurrency)
+            print(
+                f"{name:<12} {variant:<22} {percentile(latencies, 50):>8.2f} "
+                f"{percentile(latencies, 99):>8.2f} {statements / len(latencies):>9.1f}"
+            )
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--database-url", default="")
+    parser.add_argument("--reset", action="store_true", help="Drop and reseed --database-url if it already has tables")
+    args = parser.parse_args()
+    asyncio.run(main(args.ops, args.concurrency, args.database_url, args.reset))
@@ -0,0 +1,3 @@
+from blog_project.server import main
+
+main()
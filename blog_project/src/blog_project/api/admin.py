@@ -1,63 +1,253 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from typing import List
 import logging
 
-from blog_project.db.session import get_db
+from blog_project.db.session import engine, get_db, get_read_db, replicas
+from blog_project.db.instrumentation import pool_stats, pool_status, statement_stats
+from blog_project.db import search
 from blog_project.models.models import User, Post
-from blog_project.schemas.schemas import UserResponse, PostResponse
-from blog_project.core.deps import get_current_admin
+from blog_project.schemas.schemas import (
+    BulkActionResult,
+    PostResponse,
+    PostSelection,
+    UserResponse,
+    UserSelection
+)
+from blog_project.core.deps import get_current_admin, invalidate_principal, principal_cache
+from blog_project.core.export import export_response
+from blog_project.core.revocation import revocations
+from blog_project.core.post_invalidation import post_invalidations
+from blog_project.core.profiling import profile_store
+from blog_project.core.response_cache import (
+    invalidate_all_posts,
+    invalidate_post,
+    post_cache,
+    post_list_cache
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.get("/users", response_model=List[UserResponse])
 async def get_all_users(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     admin: User = Depends(get_current_admin)
 ):
-    logger.info(f"Admin {admin.email} fetching all users")
+    logger.info("Admin %s fetching all users", admin.email)
     result = await db.execute(select(User))
     return result.scalars().all()
 
+@router.get("/users/export")
+async def export_users(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    admin: User = Depends(get_current_admin)
+):
+    logger.info("Admin %s exporting users as %s", admin.email, format)
+    columns = ["id", "email", "is_active", "role"]
+    query = select(User.id, User.email, User.is_active, User.role).order_by(User.id)
+    return export_response(query, columns, format, "users")
+
 @router.delete("/users/{user_id}")
 async def delete_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
     admin: User = Depends(get_current_admin)
 ):
-    logger.info(f"Admin {admin.email} deleting user {user_id}")
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    if not user:
+    logger.info("Admin %s deleting user %s", admin.email, user_id)
+    await search.remove_author_posts(db, user_id)
+    # Deleted explicitly: databases created before posts.author_id became
+    # ON DELETE CASCADE still have a NO ACTION key that blocks the user
+    # delete. View counts go with the posts.
+    await db.execute(delete(Post).where(Post.author_id == user_id))
+    result = await db.execute(delete(User).where(User.id == user_id))
+    if result.rowcount == 0:
+        await db.rollback()
         raise HTTPException(status_code=404, detail="User not found")
-    
-    await db.delete(user)
+    await revocations.record(db, user_ids=[user_id])
+    await post_invalidations.record_all(db)
     await db.commit()
+    invalidate_principal(user_id)
+    # The user's posts went with them
+    invalidate_all_posts()
     return {"message": "User deleted successfully"}
 
+def user_criteria(selection: UserSelection, admin: User) -> list:
+    # Bulk operations never touch the calling admin's own account
+    criteria = [User.id != admin.id]
+    if selection.ids is not None:
+        criteria.append(User.id.in_(selection.ids))
+    if selection.role is not None:
+        criteria.append(User.role == selection.role)
+    if selection.is_active is not None:
+        criteria.append(User.is_active.is_(selection.is_active))
+    return criteria
+
+@router.post("/users/bulk-delete", response_model=BulkActionResult)
+async def bulk_delete_users(
+    selection: UserSelection,
+    db: AsyncSession = Depends(get_db),
+    admin: User = Depends(get_current_admin)
+):
+    criteria = user_criteria(selection, admin)
+    selected_posts = Post.author_id.in_(select(User.id).where(*criteria))
+    await search.remove_matching_posts(db, select(Post.id).where(selected_posts))
+    # As in delete_user, not left to the foreign key
+    await db.execute(delete(Post).where(selected_posts).execution_options(synchronize_session=False))
+    result = await db.execute(
+        delete(User).where(*criteria).returning(User.id).execution_options(synchronize_session=False)
+    )
+    user_ids = result.scalars().all()
+    await revocations.record(db, user_ids=user_ids)
+    if user_ids:
+        await post_invalidations.record_all(db)
+    await db.commit()
+    logger.info("Admin %s bulk deleted %s users", admin.email, len(user_ids))
+    if user_ids:
+        principal_cache.clear()
+        invalidate_all_posts()
+    return {"affected": len(user_ids)}
+
+@router.post("/users/bulk-deactivate", response_model=BulkActionResult)
+async def bulk_deactivate_users(
+    selection: UserSelection,
+    db: AsyncSession = Depends(get_db),
+    admin: User = Depends(get_current_admin)
+):
+    result = await db.execute(
+        update(User)
+        .where(*user_criteria(selection, admin), User.is_active.is_(True))
+        .values(is_active=False)
+        .returning(User.id)
+        .execution_options(synchronize_session=False)
+    )
+    user_ids = result.scalars().all()
+    await revocations.record(db, user_ids=user_ids)
+    await db.commit()
+    logger.info("Admin %s bulk deactivated %s users", admin.email, len(user_ids))
+    if user_ids:
+        principal_cache.clear()
+    return {"affected": len(user_ids)}
+
 @router.get("/posts", response_model=List[PostResponse])
 async def get_all_posts(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     admin: User = Depends(get_current_admin)
 ):
-    logger.info(f"Admin {admin.email} fetching all posts")
+    logger.info("Admin %s fetching all posts", admin.email)
     result = await db.execute(select(Post))
     return result.scalars().all()
 
+@router.get("/posts/export")
+async def export_posts(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    admin: User = Depends(get_current_admin)
+):
+    logger.info("Admin %s exporting posts as %s", admin.email, format)
+    columns = ["id", "title", "content", "published", "created_at", "author_id"]
+    query = select(
+        Post.id, Post.title, Post.content, Post.published, Post.created_at, Post.author_id
+    ).order_by(Post.id)
+    return export_response(query, columns, format, "posts")
+
 @router.delete("/posts/{post_id}")
 async def delete_post(
     post_id: int,
     db: AsyncSession = Depends(get_db),
     admin: User = Depends(get_current_admin)
 ):
-    logger.info(f"Admin {admin.email} deleting post {post_id}")
-    result = await db.execute(select(Post).where(Post.id == post_id))
-    post = result.scalar_one_or_none()
-    if not post:
+    logger.info("Admin %s deleting post %s", admin.email, post_id)
+    await search.remove_posts(db, [post_id])
+    result = await db.execute(delete(Post).where(Post.id == post_id))
+    if result.rowcount == 0:
+        await db.rollback()
         raise HTTPException(status_code=404, detail="Post not found")
-    
-    await db.delete(post)
+    await post_invalidations.record(db, [post_id])
     await db.commit()
+    invalidate_post(post_id)
     return {"message": "Post deleted successfully"}
+
+def post_criteria(selection: PostSelection) -> list:
+    criteria = []
+    if selection.ids is not None:
+        criteria.append(Post.id.in_(selection.ids))
+    if selection.author_ids is not None:
+        criteria.append(Post.author_id.in_(selection.author_ids))
+    if selection.published is not None:
+        criteria.append(Post.published.is_(selection.published))
+    if selection.created_before is not None:
+        criteria.append(Post.created_at < selection.created_before)
+    return criteria
+
+@router.post("/posts/bulk-delete", response_model=BulkActionResult)
+async def bulk_delete_posts(
+    selection: PostSelection,
+    db: AsyncSession = Depends(get_db),
+    admin: User = Depends(get_current_admin)
+):
+    criteria = post_criteria(selection)
+    await search.remove_matching_posts(db, select(Post.id).where(*criteria))
+    result = await db.execute(delete(Post).where(*criteria).execution_options(synchronize_session=False))
+    if result.rowcount:
+        await post_invalidations.record_all(db)
+    await db.commit()
+    logger.info("Admin %s bulk deleted %s posts", admin.email, result.rowcount)
+    if result.rowcount:
+        invalidate_all_posts()
+    return {"affected": result.rowcount}
+
+@router.post("/posts/bulk-unpublish", response_model=BulkActionResult)
+async def bulk_unpublish_posts(
+    selection: PostSelection,
+    db: AsyncSession = Depends(get_db),
+    admin: User = Depends(get_current_admin)
+):
+    result = await db.execute(
+        update(Post)
+        .where(*post_criteria(selection), Post.published.is_(True))
+        .values(published=False)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        await post_invalidations.record_all(db)
+    await db.commit()
+    logger.info("Admin %s bulk unpublished %s posts", admin.email, result.rowcount)
+    if result.rowcount:
+        invalidate_all_posts()
+    return {"affected": result.rowcount}
+
+@router.get("/diagnostics/cache")
+async def get_cache_stats(admin: User = Depends(get_current_admin)):
+    return {
+        "posts": post_cache.stats(),
+        "post_lists": post_list_cache.stats(),
+        "principals": principal_cache.stats()
+    }
+
+@router.get("/diagnostics/db")
+async def get_db_stats(
+    reset: bool = False,
+    admin: User = Depends(get_current_admin)
+):
+    stats = {
+        "pool": pool_status(engine),
+        "checkout": pool_stats.snapshot(),
+        "statements": statement_stats.top(),
+        "replicas": replicas.status() if replicas is not None else []
+    }
+    if reset:
+        pool_stats.reset()
+        statement_stats.reset()
+    return stats
+
+@router.get("/diagnostics/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(
+    profile_id: str,
+    admin: User = Depends(get_current_admin)
+):
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found or expired")
+    return PlainTextResponse(profile)
@@ -4,32 +4,102 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import logging
 
+from blog_project.db import crud
 from blog_project.db.session import get_db
 from blog_project.models.models import User
-from blog_project.schemas.schemas import Token
-from blog_project.core.security import verify_password, create_access_token
+from blog_project.schemas.schemas import RefreshRequest, Token
+from blog_project.core.deps import oauth2_scheme
+from blog_project.core.revocation import revocations
+from blog_project.core.security import (
+    create_access_token,
+    create_refresh_token,
+    new_token_id,
+    verify_password_async,
+    verify_token
+)
+from blog_project.core.config import settings
+from blog_project.core.rate_limit import login_rate_limiter
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.post("/login", response_model=Token)
+def issue_tokens(user_id: int, role: str, family_id: str, jti: str) -> dict:
+    return {
+        "access_token": create_access_token(data={"sub": str(user_id), "role": role}, family_id=family_id),
+        "refresh_token": create_refresh_token(user_id, family_id, jti),
+        "token_type": "bearer"
+    }
+
+@router.post(
+    "/login",
+    response_model=Token,
+    dependencies=[Depends(login_rate_limiter)] if settings.RATE_LIMIT_ENABLED else []
+)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db)
 ):
-    logger.info(f"Login attempt for email: {form_data.username}")
+    logger.info("Login attempt for email: %s", form_data.username)
     
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(form_data.password, user.password_hash):
-        logger.warning(f"Failed login attempt for email: {form_data.username}")
+    if not user or not await verify_password_async(form_data.password, user.password_hash):
+        logger.warning("Failed login attempt for email: %s", form_data.username)
         raise HTTPException(status_code=401, detail="Incorrect email or password")
     
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     
-    access_token = create_access_token(data={"sub": str(user.id), "role": user.role.value})
-    logger.info(f"User {user.email} logged in successfully")
+    # Each login starts a token family; refreshes rotate within it
+    family_id, jti = new_token_id(), new_token_id()
+    await crud.create_token_family(db, family_id, user.id, jti)
+    await db.commit()
+    logger.info("User %s logged in successfully", user.email)
     
-    return {"access_token": access_token, "token_type": "bearer"}
+    return issue_tokens(user.id, user.role.value, family_id, jti)
+
+@router.post("/refresh", response_model=Token)
+async def refresh(body: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    # New access and refresh tokens without a password check (no bcrypt).
+    # The presented refresh token is used up; replaying it revokes the family.
+    invalid = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    payload = verify_token(body.refresh_token, token_type="refresh")
+    if payload is None:
+        raise invalid
+    try:
+        user_id, family_id, jti = int(payload["sub"]), payload["fid"], payload["jti"]
+    except (KeyError, TypeError, ValueError):
+        raise invalid
+
+    new_jti = new_token_id()
+    if not await crud.rotate_token_family(db, family_id, user_id, jti, new_jti):
+        if await crud.revoke_token_family(db, family_id):
+            logger.warning("Refresh token reuse for user %s; token family %s revoked", user_id, family_id)
+            await revocations.record(db, family_id=family_id)
+            await db.commit()
+        raise invalid
+
+    user = (await db.execute(select(User.role, User.is_active).where(User.id == user_id))).one_or_none()
+    if user is None or not user.is_active:
+        raise invalid
+    await db.commit()
+    return issue_tokens(user_id, user.role.value, family_id, new_jti)
+
+@router.post("/logout")
+async def logout(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
+    # Revokes the session's whole token family: this access token, its
+    # refresh token and any tokens refreshed from it
+    payload = verify_token(token)
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    family_id = payload.get("fid")
+    if family_id is not None:
+        await crud.revoke_token_family(db, family_id)
+        await revocations.record(db, family_id=family_id)
+        await db.commit()
+    return {"message": "Logged out successfully"}
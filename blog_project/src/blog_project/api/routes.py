@@ -1,45 +1,228 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from sqlalchemy import select, func, insert, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from datetime import datetime
+from typing import List, Literal, Optional, Tuple
+import json
 import logging
 
-from blog_project.db.session import get_db
-from blog_project.models.models import Post, User
-from blog_project.schemas.schemas import PostCreate, PostResponse
+from blog_project.db.crud import POST_COLUMNS
+from blog_project.db.session import get_db, get_read_db, is_primary, read_pinned
+from blog_project.db import crud, search
+from blog_project.models.models import Post, PostView, User
+from blog_project.schemas.schemas import (
+    BulkPostResult,
+    PostCreate,
+    PostPage,
+    PostResponse,
+    PostSearchPage,
+    PopularPost,
+    post_page_adapter_for
+)
 from blog_project.core.deps import get_current_active_user
+from blog_project.core.config import settings
+from blog_project.core.cache import TTLCache
+from blog_project.core.view_counter import view_counter
+from blog_project.core.post_invalidation import post_invalidations
+from blog_project.core.pagination import Cursor, decode_cursor, decode_rank_cursor, encode_cursor, encode_rank_cursor
+from blog_project.core.response_cache import (
+    cached_json_response,
+    invalidate_post,
+    post_cache,
+    post_list_cache
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.get("/")
-async def read_posts(skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_db)):
-    from sqlalchemy import func
-    
-    # Get total count
-    count_query = select(func.count(Post.id))
-    total = await db.scalar(count_query)
-    
-    # Get paginated posts
-    query = select(Post).offset(skip).limit(limit)
-    result = await db.execute(query)
-    posts = result.scalars().all()
-    
+# Total post count is shared by every list page; a short TTL keeps the front
+# page from running a full count on each request.
+post_count_cache = TTLCache(maxsize=1, ttl=settings.POSTS_COUNT_CACHE_TTL_SECONDS)
+
+# Popular lists by limit; counts only change when views are flushed
+popular_cache = TTLCache(maxsize=16, ttl=settings.VIEW_FLUSH_INTERVAL_SECONDS)
+
+async def get_total_posts(db: AsyncSession) -> int:
+    total = post_count_cache.get("posts")
+    if total is None:
+        total = await db.scalar(select(func.count(Post.id)).where(Post.published.is_(True)))
+        post_count_cache.set("posts", total)
+    return total
+
+# Fields a list page can be narrowed to with ?fields=. "excerpt" is the start
+# of content, cut by the database so the full text is never transferred.
+POST_FIELDS = {
+    **{column.key: column for column in POST_COLUMNS},
+    "excerpt": func.substr(Post.content, 1, settings.POST_EXCERPT_LENGTH).label("excerpt")
+}
+FULL_FIELDS = tuple(column.key for column in POST_COLUMNS)
+SUMMARY_FIELDS = ("title", "published", "id", "created_at", "author_id", "excerpt")
+
+def parse_fields(fields: Optional[str], view: str) -> Tuple[str, ...]:
+    # Canonical order, so equal field sets share cache entries and adapters
+    if fields is None:
+        return SUMMARY_FIELDS if view == "summary" else FULL_FIELDS
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - POST_FIELDS.keys()
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=400,
+            detail=f"fields must be a comma-separated subset of: {', '.join(POST_FIELDS)}"
+        )
+    return tuple(name for name in POST_FIELDS if name in requested)
+
+def posts_page_query(position: Optional[Cursor], skip: int, limit: int, *criteria, fields: Tuple[str, ...] = FULL_FIELDS):
+    # Columns are selected directly so list pages skip ORM identity mapping
+    # and model validation; id and created_at are always needed for cursors.
+    # Published posts newest first, with id as tie-breaker so the order is
+    # stable. Without criteria this walks ix_posts_published_created_at_id;
+    # with an author filter, ix_posts_author_id_created_at_id.
+    columns = [POST_FIELDS[name] for name in fields]
+    columns += [column for column in (Post.id, Post.created_at) if column.key not in fields]
+    query = select(*columns).where(Post.published.is_(True), *criteria)
+    position_key = tuple_(Post.created_at, Post.id)
+    if position is None:
+        query = query.order_by(Post.created_at.desc(), Post.id.desc()).offset(skip)
+    elif position.direction == "next":
+        query = (
+            query.where(position_key < (position.created_at, position.id))
+            .order_by(Post.created_at.desc(), Post.id.desc())
+        )
+    else:
+        query = (
+            query.where(position_key > (position.created_at, position.id))
+            .order_by(Post.created_at.asc(), Post.id.asc())
+        )
+    # One extra row tells whether another page exists
+    return query.limit(limit + 1)
+
+async def fetch_page(
+    db: AsyncSession,
+    cursor: Optional[str],
+    skip: int,
+    limit: int,
+    *criteria,
+    fields: Tuple[str, ...] = FULL_FIELDS
+) -> dict:
+    position = decode_cursor(cursor) if cursor else None
+    result = await db.execute(posts_page_query(position, skip, limit, *criteria, fields=fields))
+    posts = [dict(row) for row in result.mappings()]
+    has_more = len(posts) > limit
+    posts = posts[:limit]
+
+    if position is not None and position.direction == "prev":
+        posts.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, position is not None or skip > 0
+
     return {
-        "total": total,
-        "skip": skip,
         "limit": limit,
+        "next_cursor": encode_cursor(posts[-1]["created_at"], posts[-1]["id"]) if has_next and posts else None,
+        "prev_cursor": encode_cursor(posts[0]["created_at"], posts[0]["id"], "prev") if has_prev and posts else None,
         "data": posts
     }
 
+def response_cache_ttl(db: AsyncSession) -> Optional[float]:
+    # A replica can still be behind a write that has just cleared the caches.
+    # Its reads are kept only for the read-your-writes window, the lag the pin
+    # cookie already allows for, so a stale copy is not served (and confirmed
+    # by ETag) for the full POST_CACHE_TTL_SECONDS.
+    return None if is_primary(db) else settings.READ_YOUR_WRITES_SECONDS
+
+@router.get("/", response_model=PostPage)
+async def read_posts(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of post fields, e.g. id,title,created_at"),
+    view: Literal["full", "summary"] = Query("full", description="summary: excerpt instead of content"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="skip cannot be combined with cursor")
+    selected = parse_fields(fields, view)
+    cache_key = (skip, limit, cursor, selected)
+    # Pinned clients skip cached pages, which may have come from a lagging replica
+    entry = None if read_pinned(request) else post_list_cache.get(cache_key)
+    if entry is None:
+        page = await fetch_posts_page(db, skip, limit, cursor, selected)
+        # Rows are dumped through the field set's adapter; selected-only
+        # helper columns (id, created_at) are left out there
+        entry = post_list_cache.store(
+            cache_key, post_page_adapter_for(selected).dump_json(page), response_cache_ttl(db)
+        )
+    return await cached_json_response(request, entry)
+
+async def fetch_posts_page(
+    db: AsyncSession,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    fields: Tuple[str, ...] = FULL_FIELDS
+) -> dict:
+    total = await get_total_posts(db)
+    return {"total": total, "skip": skip, **await fetch_page(db, cursor, skip, limit, fields=fields)}
+
+@router.get("/search", response_model=PostSearchPage)
+async def search_posts(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    after = tuple(decode_rank_cursor(cursor)) if cursor else None
+    results = await search.search_posts(db, q, limit + 1, after)
+    has_more = len(results) > limit
+    results = results[:limit]
+    last_post, last_score = results[-1] if results else (None, None)
+    return {
+        "q": q,
+        "limit": limit,
+        "next_cursor": encode_rank_cursor(last_score, last_post.id) if has_more else None,
+        "data": [post for post, _ in results]
+    }
+
+def popular_posts_query(limit: int):
+    # Walks ix_post_views_views_post_id from the top; no sort of posts
+    return (
+        select(*POST_COLUMNS, PostView.views)
+        .select_from(PostView)
+        .join(Post, Post.id == PostView.post_id)
+        .where(Post.published.is_(True))
+        .order_by(PostView.views.desc(), PostView.post_id.desc())
+        .limit(limit)
+    )
+
+@router.get("/popular", response_model=List[PopularPost])
+async def popular_posts(
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db)
+):
+    posts = popular_cache.get(limit)
+    if posts is None:
+        posts = [dict(row) for row in (await db.execute(popular_posts_query(limit))).mappings()]
+        popular_cache.set(limit, posts)
+    return posts
+
 @router.get("/{post_id}", response_model=PostResponse) 
-async def get_post(post_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Post).where(Post.id == post_id))
-    post = result.scalar_one_or_none()
-    if not post:
-        raise HTTPException(status_code=404, detail="Post not found")
-    return post
+async def get_post(post_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
+    entry = None if read_pinned(request) else post_cache.get(post_id)
+    if entry is None:
+        result = await db.execute(select(Post).where(Post.id == post_id))
+        post = result.scalar_one_or_none()
+        if not post:
+            raise HTTPException(status_code=404, detail="Post not found")
+        entry = post_cache.store(
+            post_id, PostResponse.model_validate(post).model_dump_json().encode("utf-8"), response_cache_ttl(db)
+        )
+    if settings.VIEW_COUNTS_ENABLED:
+        view_counter.record(post_id)
+    return await cached_json_response(request, entry)
 
 @router.post("/", response_model=PostResponse, status_code=status.HTTP_201_CREATED)
 async def create_post(
@@ -47,14 +230,111 @@ async def create_post(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    logger.info(f"User {current_user.email} creating post")
-    new_post = Post(title=post.title, content=post.content, published=post.published, author_id=current_user.id)
-    db.add(new_post)
+    logger.info("User %s creating post", current_user.email)
+    new_post = await crud.create_post(db, current_user.id, post.title, post.content, post.published)
+    await post_invalidations.record(db, [new_post["id"]])
     await db.commit()
-    await db.refresh(new_post)
-    logger.info(f"Post created successfully with id: {new_post.id}")
+    post_list_cache.clear()
+    logger.info("Post created successfully with id: %s", new_post["id"])
     return new_post
 
+def parse_bulk_items(body: bytes, ndjson: bool):
+    # Returns (valid items with their input index, per-item errors)
+    if ndjson:
+        lines = [line for line in body.splitlines() if line.strip()]
+        raw_items = lines
+    else:
+        try:
+            raw_items = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON array of posts")
+        if not isinstance(raw_items, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array of posts")
+
+    if len(raw_items) > settings.BULK_INSERT_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_INSERT_MAX_ITEMS} posts per request"
+        )
+
+    items, errors = [], []
+    for index, raw in enumerate(raw_items):
+        try:
+            item = PostCreate.model_validate_json(raw) if ndjson else PostCreate.model_validate(raw)
+        except ValidationError as exc:
+            errors.append({"index": index, "errors": exc.errors(include_url=False, include_context=False)})
+            continue
+        items.append((index, item))
+    return items, errors
+
+@router.post(
+    "/bulk",
+    response_model=BulkPostResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": {"$ref": "#/components/schemas/PostCreate"}}
+                },
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def bulk_create_posts(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    ndjson = request.headers.get("content-type", "").startswith("application/x-ndjson")
+    items, errors = parse_bulk_items(await request.body(), ndjson)
+    # A failed chunk's rollback expires current_user, and reloading its
+    # attributes would need lazy IO; read what the loop needs up front
+    author_id, email = current_user.id, current_user.email
+    logger.info("User %s bulk creating %s posts", email, len(items))
+
+    ids: List[int] = []
+    chunk_size = settings.BULK_INSERT_CHUNK_SIZE
+    for start in range(0, len(items), chunk_size):
+        chunk = items[start:start + chunk_size]
+        created_at = datetime.utcnow()
+        rows = [
+            {
+                "title": item.title,
+                "content": item.content,
+                "published": item.published,
+                "author_id": author_id,
+                "created_at": created_at,
+            }
+            for _, item in chunk
+        ]
+        # One transaction per chunk; executemany with RETURNING is sent as
+        # multi-row INSERT ... VALUES (...), (...) RETURNING id
+        try:
+            result = await db.execute(
+                insert(Post).returning(Post.id, sort_by_parameter_order=True),
+                rows
+            )
+            chunk_ids = list(result.scalars().all())
+            await search.index_posts(
+                db, [(post_id, row["title"], row["content"]) for post_id, row in zip(chunk_ids, rows)]
+            )
+            await post_invalidations.record_all(db)
+            await db.commit()
+        except SQLAlchemyError as exc:
+            await db.rollback()
+            logger.error("Bulk insert chunk at item %s failed: %s", chunk[0][0], exc)
+            errors.extend({"index": index, "errors": ["Database error"]} for index, _ in chunk)
+            continue
+        ids.extend(chunk_ids)
+
+    if ids:
+        post_list_cache.clear()
+    errors.sort(key=lambda error: error["index"])
+    logger.info("Bulk insert by %s: %s inserted, %s failed", email, len(ids), len(errors))
+    return {"inserted": len(ids), "ids": ids, "errors": errors}
+
 @router.put("/{post_id}", response_model=PostResponse)
 async def update_post(
     post_id: int,
@@ -62,19 +342,13 @@ async def update_post(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    result = await db.execute(select(Post).where(Post.id == post_id))
-    post = result.scalar_one_or_none()
-    if not post:
-        raise HTTPException(status_code=404, detail="Post not found")
-    if post.author_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to update this post")
-    
-    post.title = post_update.title
-    post.content = post_update.content
-    post.published = post_update.published
+    post = await crud.update_own_post(
+        db, post_id, current_user.id, post_update.title, post_update.content, post_update.published
+    )
+    await post_invalidations.record(db, [post_id])
     await db.commit()
-    await db.refresh(post)
-    logger.info(f"Post {post_id} updated by {current_user.email}")
+    invalidate_post(post_id)
+    logger.info("Post %s updated by %s", post_id, current_user.email)
     return post
 
 @router.delete("/{post_id}")
@@ -83,14 +357,9 @@ async def delete_post(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    result = await db.execute(select(Post).where(Post.id == post_id))
-    post = result.scalar_one_or_none()
-    if not post:
-        raise HTTPException(status_code=404, detail="Post not found")
-    if post.author_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to delete this post")
-    
-    await db.delete(post)
+    await crud.delete_own_post(db, post_id, current_user.id)
+    await post_invalidations.record(db, [post_id])
     await db.commit()
-    logger.info(f"Post {post_id} deleted by {current_user.email}")
-    return {"message": "Post deleted successfully"}
\ No newline at end of file
+    invalidate_post(post_id)
+    logger.info("Post %s deleted by %s", post_id, current_user.email)
+    return {"message": "Post deleted successfully"}
@@ -5,15 +5,16 @@ import logging
 from blog_project.db.session import get_db
 from blog_project.models.models import User
 from blog_project.schemas.schemas import UserResponse, PasswordChange
-from blog_project.core.deps import get_current_active_user
-from blog_project.core.security import verify_password, get_password_hash
+from blog_project.core.deps import get_current_active_user, invalidate_principal
+from blog_project.core.revocation import revocations
+from blog_project.core.security import verify_password_async, get_password_hash_async
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_profile(current_user: User = Depends(get_current_active_user)):
-    logger.info(f"User {current_user.email} fetching profile")
+    logger.info("User %s fetching profile", current_user.email)
     return current_user
 
 @router.put("/change-password")
@@ -22,14 +23,19 @@ async def change_password(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    logger.info(f"User {current_user.email} changing password")
+    logger.info("User %s changing password", current_user.email)
     
-    if not verify_password(password_data.old_password, current_user.password_hash):
-        logger.warning(f"Failed password change for {current_user.email}: incorrect old password")
+    # current_user may be a cached principal, so load the row with its hash
+    user = await db.get(User, current_user.id)
+    if user is None or not await verify_password_async(password_data.old_password, user.password_hash):
+        logger.warning("Failed password change for %s: incorrect old password", current_user.email)
         raise HTTPException(status_code=400, detail="Incorrect old password")
     
-    current_user.password_hash = get_password_hash(password_data.new_password)
+    user.password_hash = await get_password_hash_async(password_data.new_password)
+    # Every token issued so far, on every device, stops working
+    await revocations.record(db, user_ids=[user.id])
     await db.commit()
-    logger.info(f"Password changed successfully for {current_user.email}")
+    invalidate_principal(user.id)
+    logger.info("Password changed successfully for %s", current_user.email)
     
     return {"message": "Password changed successfully"}
@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from typing import Optional
 import logging
 
-from blog_project.db.session import get_db
-from blog_project.models.models import User
-from blog_project.schemas.schemas import UserCreate, UserResponse
-from blog_project.core.security import get_password_hash
+from blog_project.db import crud
+from blog_project.db.session import get_db, get_read_db
+from blog_project.api.routes import fetch_page
+from blog_project.models.models import Post, User
+from blog_project.schemas.schemas import AuthorPostPage, UserCreate, UserResponse
+from blog_project.core.security import get_password_hash_async
 
 logger = logging.getLogger(__name__)
 
@@ -14,30 +17,33 @@ router = APIRouter()
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
-    logger.info(f"Creating user with email: {user.email}")
-    
-    # Check if user already exists
-    result = await db.execute(select(User).where(User.email == user.email))
-    if result.scalar_one_or_none():
-        logger.warning(f"User with email {user.email} already exists")
+    logger.info("Creating user with email: %s", user.email)
+    new_user = await crud.create_user(db, user.email, await get_password_hash_async(user.password), user.role)
+    if new_user is None:
+        logger.warning("User with email %s already exists", user.email)
         raise HTTPException(status_code=400, detail="Email already registered")
-    
-    new_user = User(
-        email=user.email,
-        password_hash=get_password_hash(user.password),
-        is_active=True,
-        role=user.role
-    )
-    db.add(new_user)
     await db.commit()
-    await db.refresh(new_user)
-    logger.info(f"User created successfully with id: {new_user.id}")
+    logger.info("User created successfully with id: %s", new_user["id"])
     return new_user
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(user_id: int, db: AsyncSession = Depends(get_db)):
+async def get_user(user_id: int, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
+
+@router.get("/{user_id}/posts", response_model=AuthorPostPage)
+async def get_user_posts(
+    user_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    # Cursor-only paging: deep offsets would walk the author's whole index range
+    page = await fetch_page(db, cursor, 0, limit, Post.author_id == user_id)
+    # Only an empty page needs to tell "no posts" apart from "no such user"
+    if not page["data"] and await db.scalar(select(User.id).where(User.id == user_id)) is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return {"author_id": user_id, **page}
@@ -0,0 +1,82 @@
+from sqlalchemy import Connection, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+import asyncio
+import logging
+
+from blog_project.core.config import settings
+from blog_project.core.logging_config import setup_logging, shutdown_logging
+from blog_project.core.security import get_password_hash_async, shutdown_hash_executor
+from blog_project.db.base import Base
+from blog_project.db.search import ensure_search_index
+from blog_project.db.session import engine
+from blog_project.models.models import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+# Any constant shared by every process of this app ("blog")
+BOOTSTRAP_LOCK_KEY = 0x626C6F67
+
+async def _lock(conn: AsyncConnection) -> None:
+    # Serialises concurrent bootstraps (several workers or containers
+    # starting at once). Both locks are released when the transaction ends.
+    if conn.dialect.name == "postgresql":
+        await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": BOOTSTRAP_LOCK_KEY})
+    elif conn.dialect.name == "sqlite":
+        await conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+async def seed_admin(conn: AsyncConnection) -> None:
+    # Looked up first so the bcrypt hash is only paid on the very first boot
+    existing = await conn.scalar(select(User.id).where(User.email == settings.ADMIN_EMAIL))
+    if existing is not None:
+        return
+    await conn.execute(insert(User).values(
+        email=settings.ADMIN_EMAIL,
+        password_hash=await get_password_hash_async(settings.ADMIN_PASSWORD),
+        is_active=True,
+        role=UserRole.ADMIN
+    ))
+    logger.info("Default admin created: %s", settings.ADMIN_EMAIL)
+
+def _create_indexes(sync_conn: Connection) -> None:
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+async def ensure_indexes(conn: AsyncConnection) -> None:
+    # create_all() skips tables that already exist, indexes included, so
+    # indexes added to a model later (such as the posts keyset indexes) are
+    # created here. Indexes already there are left alone.
+    await conn.run_sync(_create_indexes)
+
+async def bootstrap(bind: AsyncEngine = engine) -> None:
+    # Schema setup and seeding; idempotent and safe to run concurrently
+    async with bind.begin() as conn:
+        await _lock(conn)
+        await conn.run_sync(Base.metadata.create_all)
+        await ensure_indexes(conn)
+        await ensure_search_index(conn)
+        await seed_admin(conn)
+
+async def _run() -> None:
+    try:
+        await bootstrap()
+    finally:
+        await engine.dispose()
+        shutdown_hash_executor()
+
+def run_once() -> None:
+    logger.info("Bootstrapping database...")
+    asyncio.run(_run())
+    logger.info("Bootstrap complete")
+
+def main() -> None:
+    # `blog-project-bootstrap` / `python -m blog_project.bootstrap`: run once
+    # per deploy, before starting workers with BOOTSTRAP_ON_STARTUP=false
+    setup_logging()
+    try:
+        run_once()
+    finally:
+        shutdown_logging()
+
+if __name__ == "__main__":
+    main()
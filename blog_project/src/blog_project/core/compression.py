@@ -0,0 +1,148 @@
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import lru_cache
+from starlette.datastructures import MutableHeaders
+from typing import Callable, Dict, Optional
+import asyncio
+import brotli
+import gzip
+import zstandard
+
+from blog_project.core.config import settings
+
+def _gzip(body: bytes) -> bytes:
+    # mtime=0 keeps the output, and so cached variants, deterministic
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+# Content codings in server preference order
+ENCODERS: Dict[str, Callable[[bytes], bytes]] = {
+    "zstd": lambda body: zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compress(body),
+    "br": lambda body: brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY),
+    "gzip": _gzip,
+}
+
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "image/svg+xml",
+})
+
+@lru_cache(maxsize=256)
+def negotiate(accept_encoding: str) -> Optional[str]:
+    # Highest-q coding we support; on equal q the server's preference wins
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            qualities[coding] = quality
+    best, best_quality = None, 0.0
+    for coding in ENCODERS:
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    # Each encoded representation needs its own strong validator
+    if etag.startswith("W/"):
+        return etag
+    return '%s-%s"' % (etag[:-1], encoding)
+
+def strip_encoding(etag: str) -> str:
+    for coding in ENCODERS:
+        suffix = '-%s"' % coding
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+_executor: Optional[Executor] = None
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.COMPRESSION_WORKERS, thread_name_prefix="compress")
+    return _executor
+
+async def compress(body: bytes, encoding: str) -> bytes:
+    # Small bodies are cheaper to compress inline than to hand to a thread;
+    # zlib, brotli and zstd release the GIL, so large ones run in parallel
+    encoder = ENCODERS[encoding]
+    if len(body) < settings.COMPRESSION_THREAD_MIN_SIZE:
+        return encoder(body)
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), encoder, body)
+
+def shutdown_compression_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+def _compressible(headers: MutableHeaders, status: int) -> bool:
+    if status in (204, 304) or "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+    return content_type.startswith("text/") or content_type in COMPRESSIBLE_TYPES
+
+class CompressionMiddleware:
+    # Pure ASGI: holds the response start until the first body message, then
+    # compresses single-message bodies of at least COMPRESSION_MIN_SIZE bytes.
+    # Streaming responses (more_body) and bodies that are already encoded,
+    # such as cached compressed variants, pass through untouched.
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = negotiate(accept_encoding) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+
+        async def send_compressed(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if start is None:
+                await send(message)
+                return
+
+            pending, start = start, None
+            headers = MutableHeaders(scope=pending)
+            body = message.get("body", b"")
+            if message.get("more_body") or len(body) < self.minimum_size or not _compressible(headers, pending["status"]):
+                await send(pending)
+                await send(message)
+                return
+
+            compressed = await compress(body, encoding)
+            headers.add_vary_header("Accept-Encoding")
+            if len(compressed) < len(body):
+                headers["content-encoding"] = encoding
+                headers["content-length"] = str(len(compressed))
+                if "etag" in headers:
+                    headers["etag"] = encoded_etag(headers["etag"], encoding)
+                message = {**message, "body": compressed}
+            await send(pending)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
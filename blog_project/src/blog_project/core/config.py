@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from urllib.parse import quote_plus
-from typing import List
+from typing import List, Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Professional Blog API"
@@ -12,6 +12,17 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # How often each worker pulls revocations made by other workers
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 2
+
+    # Password hashing pool ("thread" or "process")
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+
+    # Authenticated principal cache (per worker)
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
     
     # CORS
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:8000"
@@ -20,6 +31,32 @@ class Settings(BaseSettings):
     def get_allowed_origins(self) -> List[str]:
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
     
+    # Rate limiting ("memory" per worker, or "shared" across workers via mmap)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_REQUESTS: int = 100
+    RATE_LIMIT_WINDOW_SECONDS: int = 60
+    LOGIN_RATE_LIMIT_REQUESTS: int = 10
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_MAX_CLIENTS: int = 100_000
+    RATE_LIMIT_SHARED_PATH: str = ""
+    
+    # Security headers: "off", "basic" or "strict" (empty = strict in production, off otherwise)
+    SECURITY_HEADERS_PROFILE: str = ""
+    
+    # Metrics: set METRICS_MULTIPROC_DIR so /metrics sums all workers on the host
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROC_DIR: str = ""
+    METRICS_FLUSH_INTERVAL_SECONDS: float = 5
+    
+    # Per-request query timing (Server-Timing header, N+1 warnings) and
+    # admin-triggered profiling. The header shows every caller how many queries
+    # a request ran and for how long, so timing is on by default in development
+    # only; set QUERY_TIMING_ENABLED to override
+    QUERY_TIMING_ENABLED: Optional[bool] = None
+    QUERY_REPEAT_THRESHOLD: int = 5
+    PROFILING_ENABLED: bool = False
+    PROFILING_INTERVAL_MS: float = 5
+    
     # Admin
     ADMIN_EMAIL: str = "admin@example.com"
     ADMIN_PASSWORD: str = "admin123"
@@ -27,21 +64,111 @@ class Settings(BaseSettings):
     # Environment
     ENVIRONMENT: str = "development"
 
+    # Logging goes through a bounded queue to a background writer thread.
+    # LOG_FORMAT is "json" or "text"; LOG_SAMPLING keeps a fraction of
+    # sub-warning records per logger, e.g. "uvicorn.access=0.01,blog_project.api=0.1"
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_SAMPLING: str = ""
+
+    # Schema setup and admin seeding in every worker's startup (serialised by a
+    # database lock). Disable for multi-worker deployments and run
+    # `blog-project-bootstrap` once per deploy instead.
+    BOOTSTRAP_ON_STARTUP: bool = True
+
+    # `blog-project` server: pre-forked workers sharing one listening socket.
+    # SERVER_WORKERS=0 starts one per usable CPU. SERVER_PRELOAD imports the
+    # app before forking so workers share its memory; a SIGHUP restart then
+    # reuses the loaded code instead of re-importing it.
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0
+    SERVER_PRELOAD: bool = False
+    SERVER_BACKLOG: int = 2048
+    # Longer than the load balancer's idle timeout, so it never reuses a
+    # connection the server has just closed
+    SERVER_KEEPALIVE_SECONDS: int = 75
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    SERVER_ACCESS_LOG: bool = True
+    SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+
+    # Pagination
+    POSTS_COUNT_CACHE_TTL_SECONDS: int = 30
+    # Characters of content in ?view=summary list pages
+    POST_EXCERPT_LENGTH: int = 200
+
+    # Post response cache (per worker). Writes clear it at once in the worker
+    # that made them and within POST_CACHE_SYNC_SECONDS in every other one.
+    POST_CACHE_MAX_ENTRIES: int = 1024
+    POST_CACHE_TTL_SECONDS: int = 60
+    POST_CACHE_SYNC_SECONDS: float = 2
+
+    # Response compression: zstd, br or gzip by Accept-Encoding. Bodies of
+    # COMPRESSION_THREAD_MIN_SIZE bytes and up are compressed in a thread
+    # pool instead of on the event loop.
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_THREAD_MIN_SIZE: int = 32768
+    COMPRESSION_WORKERS: int = 2
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # Admin exports: rows fetched per server-side cursor batch
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Bulk post ingestion
+    BULK_INSERT_CHUNK_SIZE: int = 500
+    BULK_INSERT_MAX_ITEMS: int = 10000
+
+    # Post view counts: aggregated per worker, upserted every interval
+    VIEW_COUNTS_ENABLED: bool = True
+    VIEW_FLUSH_INTERVAL_SECONDS: float = 5
+
     # Database Settings
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_SERVER: str
     POSTGRES_PORT: int = 5432
     POSTGRES_DB: str
+    # Full SQLAlchemy URL overriding the POSTGRES_* settings, e.g.
+    # sqlite+aiosqlite:///./blog.db for local runs and benchmarks
+    DATABASE_URL_OVERRIDE: str = ""
+    # Comma-separated SQLAlchemy URLs of read replicas (empty = primary only)
+    DATABASE_REPLICA_URLS: str = ""
+    # How long an unreachable replica is skipped before it is retried
+    REPLICA_RETRY_SECONDS: float = 30
+    # Reads from a client go to the primary for this long after its last write
+    READ_YOUR_WRITES_SECONDS: int = 5
+
+    # Connection pool (per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    # asyncpg prepared statement cache; set to 0 behind pgbouncer transaction pooling
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Distinct statements tracked by the latency diagnostics
+    DB_STATEMENT_STATS_MAX: int = 200
 
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, extra="ignore")
 
     @property
     def DATABASE_URL(self) -> str:
+        if self.DATABASE_URL_OVERRIDE:
+            return self.DATABASE_URL_OVERRIDE
         # Build the Async Postgres Connection String
         # quote_plus handles special characters in passwords (like @, #, /)
         user = quote_plus(str(self.POSTGRES_USER))
         password = quote_plus(str(self.POSTGRES_PASSWORD))
         return f"postgresql+asyncpg://{user}:{password}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def get_query_timing_enabled(self) -> bool:
+        if self.QUERY_TIMING_ENABLED is None:
+            return self.ENVIRONMENT == "development"
+        return self.QUERY_TIMING_ENABLED
+
 settings = Settings()  # type: ignore[call-arg]
\ No newline at end of file
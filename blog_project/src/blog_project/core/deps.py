@@ -4,11 +4,24 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from blog_project.db.session import get_db
+from blog_project.core.config import settings
+from blog_project.core.cache import TTLCache
 from blog_project.core.security import verify_token
 from blog_project.models.models import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
+# Active principals keyed by user id, so most authenticated requests skip the
+# users lookup. Entries are dropped on delete and password change; other
+# workers converge within the TTL.
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+def invalidate_principal(user_id: int) -> None:
+    principal_cache.pop(user_id)
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
@@ -32,12 +45,26 @@ async def get_current_user(
     except (ValueError, TypeError):
         raise credentials_exception
     
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        # Detached copy without password_hash; handlers that need the full
+        # row must load it from their session.
+        return User(**principal)
+    
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     
     if user is None:
         raise credentials_exception
     
+    if user.is_active:
+        principal_cache.set(user_id, {
+            "id": user.id,
+            "email": user.email,
+            "role": user.role,
+            "is_active": user.is_active,
+        })
+    
     return user
 
 async def get_current_active_user(
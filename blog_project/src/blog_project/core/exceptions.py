@@ -1,13 +1,14 @@
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 import logging
 
+from blog_project.core.responses import FastJSONResponse
+
 logger = logging.getLogger(__name__)
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    logger.error(f"Validation error on {request.url.path}: {exc.errors()}")
+    logger.error("Validation error on %s: %s", request.url.path, exc.errors())
     
     # Format errors for client response
     formatted_errors = []
@@ -18,7 +19,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             "type": error.get("type", "value_error")
         })
     
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "success": False,
@@ -28,15 +29,15 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
-    logger.error(f"Database error: {str(exc)}")
-    return JSONResponse(
+    logger.error("Database error: %s", exc)
+    return FastJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": "Database error occurred"}
     )
 
 async def general_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
+    return FastJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": "Internal server error"}
     )
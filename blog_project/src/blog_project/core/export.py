@@ -0,0 +1,55 @@
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import AsyncIterator, Sequence
+import csv
+import enum
+import io
+import json
+
+from blog_project.core.config import settings
+from blog_project.db.session import open_read_session
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def _plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def _encode_ndjson(columns: Sequence[str], rows) -> str:
+    return "".join(
+        json.dumps({column: _plain(value) for column, value in zip(columns, row)}, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+def _encode_csv(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_plain(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+async def _stream_rows(query, columns: Sequence[str], fmt: str) -> AsyncIterator[str]:
+    if fmt == "csv":
+        # Header goes out before the query runs so the client sees bytes at once
+        yield _encode_csv([columns])
+    # The export outlives the request's dependencies, so it owns its session
+    # (on a replica when configured). stream() uses a server-side cursor;
+    # yield_per bounds rows held in memory.
+    async with await open_read_session() as session:
+        result = await session.stream(query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        async for batch in result.partitions():
+            yield _encode_csv(batch) if fmt == "csv" else _encode_ndjson(columns, batch)
+
+def export_response(query, columns: Sequence[str], fmt: str, filename: str) -> StreamingResponse:
+    if fmt not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported export format")
+    return StreamingResponse(
+        _stream_rows(query, columns, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+    )
@@ -0,0 +1,170 @@
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import time
+
+from blog_project.core.config import settings
+
+# Attributes every LogRecord has; anything else was passed via `extra=` and is
+# emitted as a structured field.
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName", "color_message"}
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": "%s.%03dZ" % (time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)), record.msecs),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "pid": record.process,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class SamplingFilter(logging.Filter):
+    # Keeps a fraction of records below WARNING per logger, e.g.
+    # {"uvicorn.access": 0.01}. The longest matching logger prefix wins;
+    # warnings and errors are always kept.
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: Dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            prefix = name
+            while prefix:
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+                prefix = prefix.rpartition(".")[0]
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+def parse_sampling(spec: str) -> Dict[str, float]:
+    # "blog_project.api=0.1,uvicorn.access=0.01"
+    rates = {}
+    for item in spec.split(","):
+        name, sep, rate = item.strip().partition("=")
+        if sep:
+            rates[name.strip()] = float(rate)
+    return rates
+
+class DroppingQueueHandler(QueueHandler):
+    # Never blocks the caller: records are dropped when the queue is full, and
+    # the count is reported once the listener has caught up.
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.dropped_total = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens in the listener thread, not on the event loop.
+        # Log arguments must therefore be plain values, not live objects.
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self.dropped_total += 1
+            return
+        if self.dropped:
+            try:
+                self.queue.put_nowait(logging.makeLogRecord({
+                    "name": __name__,
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": "Dropped %s log records, queue full",
+                    "args": (self.dropped,),
+                }))
+                self.dropped = 0
+            except queue.Full:
+                pass
+
+class LogListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Blocking put, so stopping waits for room in a full queue
+        self.queue.put(self._sentinel)
+
+_listener: Optional[LogListener] = None
+queue_handler: Optional[DroppingQueueHandler] = None
+
+def setup_logging() -> None:
+    # Routes the root logger (and uvicorn's loggers) through a bounded queue
+    # drained by a background thread that writes to stdout. Idempotent.
+    global _listener, queue_handler
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    rates = parse_sampling(settings.LOG_SAMPLING)
+    if rates:
+        queue_handler.addFilter(SamplingFilter(rates))
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(settings.LOG_LEVEL)
+
+    # uvicorn installs its own synchronous stream handlers; send its records
+    # (including the access log) through the queue as well
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+
+    _listener = LogListener(log_queue, output)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+def shutdown_logging() -> None:
+    # Flushes queued records and stops the listener thread
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def _after_fork_in_child() -> None:
+    # The listener thread does not survive fork(), so the child starts its own
+    # before anything logs. It gets a fresh queue: the inherited one may hold
+    # the parent's unwritten records and locks taken at the time of the fork.
+    global _listener
+    if _listener is None or queue_handler is None:
+        return
+    log_queue: queue.Queue = queue.Queue(maxsize=_listener.queue.maxsize)
+    queue_handler.queue = log_queue
+    queue_handler.dropped = 0
+    queue_handler.dropped_total = 0
+    _listener = LogListener(log_queue, *_listener.handlers)
+    _listener.start()
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
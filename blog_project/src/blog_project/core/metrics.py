@@ -0,0 +1,208 @@
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+import asyncio
+import glob
+import json
+import logging
+import os
+import time
+
+from blog_project.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds; the last bucket is +Inf
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class RouteMetrics:
+    __slots__ = ("buckets", "count", "total", "statuses")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.statuses: Dict[int, int] = {}
+
+class MetricsRegistry:
+    # Per-worker counters. Only the event loop thread writes to them, so plain
+    # dicts and ints are enough: no locks on the request path.
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics()
+        metrics.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        metrics.count += 1
+        metrics.total += seconds
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def snapshot(self) -> dict:
+        return {
+            f"{method} {route}": {
+                "buckets": list(metrics.buckets),
+                "count": metrics.count,
+                "sum": metrics.total,
+                "statuses": {str(code): count for code, count in metrics.statuses.items()},
+            }
+            for (method, route), metrics in self.routes.items()
+        }
+
+metrics_registry = MetricsRegistry()
+
+class MetricsMiddleware:
+    # Pure ASGI: records latency and status per route template (e.g.
+    # /api/v1/posts/{post_id}) so label cardinality stays bounded.
+    def __init__(self, app, registry: MetricsRegistry = metrics_registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the shared scope dict
+            route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            self.registry.observe(scope["method"], route, status_code, time.perf_counter() - start)
+
+def merge_snapshots(snapshots: Iterable[dict]) -> dict:
+    merged: dict = {}
+    for snapshot in snapshots:
+        for key, data in snapshot.items():
+            target = merged.setdefault(key, {
+                "buckets": [0] * (len(LATENCY_BUCKETS) + 1),
+                "count": 0,
+                "sum": 0.0,
+                "statuses": {},
+            })
+            target["buckets"] = [a + b for a, b in zip(target["buckets"], data["buckets"])]
+            target["count"] += data["count"]
+            target["sum"] += data["sum"]
+            for code, count in data["statuses"].items():
+                target["statuses"][code] = target["statuses"].get(code, 0) + count
+    return merged
+
+def _labels(method: str, route: str, **extra: str) -> str:
+    pairs = {"method": method, "route": route, **extra}
+    return ",".join(
+        '%s="%s"' % (name, value.replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in pairs.items()
+    )
+
+def render_prometheus(snapshot: dict) -> str:
+    lines: List[str] = [
+        "# HELP http_request_duration_seconds Request latency by route template.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+    for key in sorted(snapshot):
+        method, route = key.split(" ", 1)
+        data = snapshot[key]
+        cumulative = 0
+        for bound, count in zip(bounds, data["buckets"]):
+            cumulative += count
+            lines.append(f"http_request_duration_seconds_bucket{{{_labels(method, route, le=bound)}}} {cumulative}")
+        lines.append(f"http_request_duration_seconds_sum{{{_labels(method, route)}}} {data['sum']}")
+        lines.append(f"http_request_duration_seconds_count{{{_labels(method, route)}}} {data['count']}")
+    lines += [
+        "# HELP http_requests_total Requests by route template and status code.",
+        "# TYPE http_requests_total counter",
+    ]
+    for key in sorted(snapshot):
+        method, route = key.split(" ", 1)
+        for code, count in sorted(snapshot[key]["statuses"].items()):
+            lines.append(f"http_requests_total{{{_labels(method, route, status=code)}}} {count}")
+    return "\n".join(lines) + "\n"
+
+# Multi-worker aggregation: with METRICS_MULTIPROC_DIR set, every worker
+# periodically writes its snapshot there and /metrics sums all of them. The
+# server master clears the directory when it starts and folds each exited
+# worker's last snapshot into one retired file, so totals survive worker
+# restarts without a file per dead pid.
+
+RETIRED_SNAPSHOT = "metrics-retired.json"
+
+def _snapshot_path(pid: Optional[int] = None) -> str:
+    return os.path.join(settings.METRICS_MULTIPROC_DIR, f"metrics-{pid or os.getpid()}.json")
+
+def _read_snapshot(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+def _write_json(path: str, data: dict) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def write_snapshot(registry: MetricsRegistry = metrics_registry) -> None:
+    if not settings.METRICS_MULTIPROC_DIR:
+        return
+    _write_json(_snapshot_path(), registry.snapshot())
+
+def collect(registry: MetricsRegistry = metrics_registry) -> dict:
+    snapshots = [registry.snapshot()]
+    if settings.METRICS_MULTIPROC_DIR:
+        own_path = _snapshot_path()
+        for path in glob.glob(os.path.join(settings.METRICS_MULTIPROC_DIR, "metrics-*.json")):
+            if path == own_path:
+                continue
+            try:
+                snapshots.append(_read_snapshot(path))
+            except (OSError, ValueError):
+                logger.warning("Skipping unreadable metrics snapshot %s", path)
+    return merge_snapshots(snapshots)
+
+def clear_snapshots() -> None:
+    # Master startup: files left by a previous run would otherwise be summed
+    if not settings.METRICS_MULTIPROC_DIR:
+        return
+    os.makedirs(settings.METRICS_MULTIPROC_DIR, exist_ok=True)
+    for path in glob.glob(os.path.join(settings.METRICS_MULTIPROC_DIR, "metrics-*.json*")):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def retire_snapshot(pid: int) -> None:
+    # Called by the master once worker `pid` has exited
+    if not settings.METRICS_MULTIPROC_DIR:
+        return
+    path = _snapshot_path(pid)
+    try:
+        snapshot = _read_snapshot(path)
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError):
+        logger.warning("Dropping unreadable metrics snapshot %s", path)
+        snapshot = {}
+    retired_path = os.path.join(settings.METRICS_MULTIPROC_DIR, RETIRED_SNAPSHOT)
+    try:
+        retired = _read_snapshot(retired_path)
+    except FileNotFoundError:
+        retired = {}
+    _write_json(retired_path, merge_snapshots([retired, snapshot]))
+    os.remove(path)
+
+async def run_snapshot_writer() -> None:
+    os.makedirs(settings.METRICS_MULTIPROC_DIR, exist_ok=True)
+    try:
+        while True:
+            await asyncio.sleep(settings.METRICS_FLUSH_INTERVAL_SECONDS)
+            write_snapshot()
+    finally:
+        write_snapshot()
@@ -0,0 +1,41 @@
+from fastapi import HTTPException, status
+from datetime import datetime
+from typing import NamedTuple
+import base64
+import json
+
+class Cursor(NamedTuple):
+    created_at: datetime
+    id: int
+    # "next" pages towards older rows, "prev" towards newer ones
+    direction: str = "next"
+
+def encode_cursor(created_at: datetime, id: int, direction: str = "next") -> str:
+    raw = json.dumps([created_at.isoformat(), id, direction], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Cursor:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id, direction = json.loads(base64.urlsafe_b64decode(padded))
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return Cursor(datetime.fromisoformat(created_at), int(id), direction)
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+class RankCursor(NamedTuple):
+    score: float
+    id: int
+
+def encode_rank_cursor(score: float, id: int) -> str:
+    raw = json.dumps([score, id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_rank_cursor(cursor: str) -> RankCursor:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, id = json.loads(base64.urlsafe_b64decode(padded))
+        return RankCursor(float(score), int(id))
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
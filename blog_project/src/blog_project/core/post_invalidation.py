@@ -0,0 +1,89 @@
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Iterable, Optional
+import asyncio
+import logging
+import time
+
+from blog_project.core.config import settings
+from blog_project.core.response_cache import invalidate_all_posts, invalidate_post
+from blog_project.db.session import AsyncSessionLocal
+from blog_project.models.models import PostInvalidation
+
+logger = logging.getLogger(__name__)
+
+# As for token revocations: each sync re-reads this far back so rows from
+# late commits are not missed. Rows already applied are skipped by id, so
+# the overlap does not keep clearing the caches.
+SYNC_OVERLAP_SECONDS = 60
+PURGE_INTERVAL_SECONDS = 3600
+
+class PostInvalidations:
+    # Carries post cache invalidations to the other workers. Writers record
+    # rows in their own transaction and clear their own caches after the
+    # commit as before; every worker replays the others' rows every
+    # POST_CACHE_SYNC_SECONDS.
+    def __init__(self):
+        self._applied: Dict[int, float] = {}
+        self._synced_until = 0.0
+        self._purged_at = 0.0
+
+    async def record(self, db: AsyncSession, post_ids: Iterable[Optional[int]]) -> None:
+        # None stands for every post
+        now = time.time()
+        rows = [{"post_id": post_id, "invalidated_at": now} for post_id in post_ids]
+        if not rows:
+            return
+        result = await db.execute(
+            insert(PostInvalidation).returning(PostInvalidation.id, sort_by_parameter_order=True),
+            rows
+        )
+        # The writer clears its own caches; its sync skips these rows
+        for row_id in result.scalars():
+            self._applied[row_id] = now
+
+    async def record_all(self, db: AsyncSession) -> None:
+        await self.record(db, [None])
+
+    async def sync(self) -> None:
+        started = time.time()
+        post_ids = set()
+        clear_all = False
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(PostInvalidation.id, PostInvalidation.post_id)
+                .where(PostInvalidation.invalidated_at >= self._synced_until - SYNC_OVERLAP_SECONDS)
+            )
+            for row_id, post_id in result:
+                if row_id in self._applied:
+                    continue
+                self._applied[row_id] = started
+                if post_id is None:
+                    clear_all = True
+                else:
+                    post_ids.add(post_id)
+            if started - self._purged_at >= PURGE_INTERVAL_SECONDS:
+                await session.execute(
+                    delete(PostInvalidation).where(PostInvalidation.invalidated_at < started - PURGE_INTERVAL_SECONDS)
+                )
+                await session.commit()
+                self._purged_at = started
+        if clear_all:
+            invalidate_all_posts()
+        else:
+            for post_id in post_ids:
+                invalidate_post(post_id)
+        self._synced_until = started
+        cutoff = started - 2 * SYNC_OVERLAP_SECONDS
+        self._applied = {row_id: at for row_id, at in self._applied.items() if at >= cutoff}
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.POST_CACHE_SYNC_SECONDS)
+            try:
+                await self.sync()
+            except SQLAlchemyError:
+                logger.warning("Post cache invalidation sync failed", exc_info=True)
+
+post_invalidations = PostInvalidations()
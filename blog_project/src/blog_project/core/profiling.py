@@ -0,0 +1,85 @@
+from collections import Counter
+from typing import Optional
+import sys
+import threading
+import uuid
+
+from blog_project.core.cache import TTLCache
+from blog_project.core.config import settings
+from blog_project.core.security import verify_token
+
+# Collapsed stacks of recent profiles, fetched through the admin API
+profile_store = TTLCache(maxsize=20, ttl=600)
+
+class SamplingProfiler:
+    # Samples the stack of one thread (the event loop) from a background
+    # thread at a fixed interval. Output is the collapsed-stack format used by
+    # flamegraph.pl and speedscope. Other requests handled by the same loop
+    # while profiling show up too, so profile on a quiet instance.
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+def _profile_requested(scope) -> bool:
+    requested = False
+    token: Optional[str] = None
+    for name, value in scope["headers"]:
+        if name == b"x-profile":
+            requested = value == b"1"
+        elif name == b"authorization" and value[:7].lower() == b"bearer ":
+            token = value[7:].decode("latin-1")
+    if not requested or token is None:
+        return False
+    payload = verify_token(token)
+    return payload is not None and payload.get("role") == "admin"
+
+class ProfilingMiddleware:
+    # Pure ASGI: an admin request sent with "X-Profile: 1" is profiled and the
+    # response carries X-Profile-Id, to be fetched from
+    # /api/v1/admin/diagnostics/profiles/{id}. Enable with PROFILING_ENABLED.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), (b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        profiler = SamplingProfiler(settings.PROFILING_INTERVAL_MS / 1000)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop()
+            profile_store.set(profile_id, profiler.collapsed())
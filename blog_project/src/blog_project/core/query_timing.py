@@ -0,0 +1,46 @@
+import logging
+import time
+
+from blog_project.core.config import settings
+from blog_project.db.instrumentation import RequestQueryStats, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+class QueryTimingMiddleware:
+    # Pure ASGI: counts the queries and DB time of each request (recorded by
+    # the cursor events in db.instrumentation), reports them in a
+    # Server-Timing header and logs statements repeated within one request,
+    # the usual sign of an N+1 pattern.
+    def __init__(self, app, repeat_threshold: int = None):
+        self.app = app
+        self.repeat_threshold = repeat_threshold or settings.QUERY_REPEAT_THRESHOLD
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = current_query_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                timing = (
+                    f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries", '
+                    f"app;dur={(time.perf_counter() - start) * 1000:.2f}"
+                )
+                repeated = stats.repeated(self.repeat_threshold)
+                if repeated:
+                    timing += f', db-repeat;desc="{len(repeated)} statements x{max(count for _, count in repeated)}"'
+                message["headers"] = [*message.get("headers", ()), (b"server-timing", timing.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            for statement, count in stats.repeated(self.repeat_threshold):
+                logger.warning(
+                    "Statement ran %s times in %s %s: %s", count, scope["method"], scope["path"], statement[:200]
+                )
@@ -1,34 +1,177 @@
 from fastapi import Request, HTTPException, status
-from collections import defaultdict
-from datetime import datetime, timedelta
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Iterable, List, Tuple
+import hashlib
 import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+
+from blog_project.core.config import settings
+from blog_project.core.responses import FastJSONResponse
 
 logger = logging.getLogger(__name__)
 
+RATE_LIMIT_DETAIL = "Too many requests. Please try again later."
+
+def _slide(window_start: int, current: int, previous: int, limit: int, window: int, now: float):
+    # Sliding window counter: the previous fixed window's count is weighted by
+    # how much of it still overlaps the sliding window. O(1) per request.
+    start = int(now // window) * window
+    if window_start != start:
+        previous = current if window_start == start - window else 0
+        current = 0
+        window_start = start
+    estimate = previous * (window - (now - start)) / window + current
+    if estimate >= limit:
+        return window_start, current, previous, False, max(1, int(start + window - now) + 1)
+    return window_start, current + 1, previous, True, 0
+
+class RateLimitBackend(ABC):
+    # Stores per-client counters. External stores (Redis, memcached) implement
+    # hit() against their own atomic primitives.
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window: int, now: float) -> Tuple[bool, int]:
+        ...
+
+class MemoryBackend(RateLimitBackend):
+    # Per-worker state: three ints per client in an LRU, so idle clients are
+    # evicted first once max_clients is reached.
+    def __init__(self, max_clients: int = 100_000):
+        self.max_clients = max_clients
+        self._clients: "OrderedDict[str, List[int]]" = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: int, now: float) -> Tuple[bool, int]:
+        state = self._clients.get(key)
+        if state is None:
+            state = self._clients[key] = [0, 0, 0]
+            if len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        else:
+            self._clients.move_to_end(key)
+        state[0], state[1], state[2], allowed, retry_after = _slide(
+            state[0], state[1], state[2], limit, window, now
+        )
+        return allowed, retry_after
+
+class SharedMemoryBackend(RateLimitBackend):
+    # Fixed-size table in a memory-mapped file shared by every uvicorn worker on
+    # the host. Slots are 4-way set associative; a new client takes a free slot
+    # or evicts the one with the oldest window. Updates are not locked, so
+    # concurrent hits from different workers may occasionally undercount.
+    _SLOT = struct.Struct("<QqII")
+    _WAYS = 4
+
+    def __init__(self, path: str, slots: int = 100_000):
+        self.sets = max(1, slots // self._WAYS)
+        size = self.sets * self._WAYS * self._SLOT.size
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        # Stable across processes (unlike hash()); 0 marks an empty slot
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+    async def hit(self, key: str, limit: int, window: int, now: float) -> Tuple[bool, int]:
+        slot_struct = self._SLOT
+        key_hash = self._hash(key)
+        base = (key_hash % self.sets) * self._WAYS
+        target = None
+        victim, victim_start = 0, None
+        for way in range(self._WAYS):
+            offset = (base + way) * slot_struct.size
+            slot_hash, window_start, current, previous = slot_struct.unpack_from(self._map, offset)
+            if slot_hash == key_hash:
+                target = offset
+                break
+            # Empty slots have window_start 0, so they are always taken first
+            if victim_start is None or window_start < victim_start:
+                victim, victim_start = offset, window_start
+        if target is None:
+            target = victim
+            window_start = current = previous = 0
+        window_start, current, previous, allowed, retry_after = _slide(
+            window_start, current, previous, limit, window, now
+        )
+        slot_struct.pack_into(self._map, target, key_hash, window_start, current, previous)
+        return allowed, retry_after
+
+def create_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_BACKEND == "shared":
+        path = settings.RATE_LIMIT_SHARED_PATH or os.path.join(
+            "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(),
+            "blog_project_rate_limit"
+        )
+        return SharedMemoryBackend(path, slots=settings.RATE_LIMIT_MAX_CLIENTS)
+    return MemoryBackend(max_clients=settings.RATE_LIMIT_MAX_CLIENTS)
+
 class RateLimiter:
-    def __init__(self, requests: int = 100, window: int = 60):
+    # Usable as a route dependency; `scope` namespaces keys so several
+    # limiters can share one backend.
+    def __init__(self, requests: int = 100, window: int = 60, backend: RateLimitBackend = None, scope: str = "global"):
         self.requests = requests
         self.window = window
-        self.clients = defaultdict(list)
-    
+        self.backend = backend or MemoryBackend()
+        self.scope = scope
+
+    async def check(self, client_key: str) -> Tuple[bool, int]:
+        return await self.backend.hit(f"{self.scope}:{client_key}", self.requests, self.window, time.time())
+
     async def __call__(self, request: Request):
-        client_ip = request.client.host
-        now = datetime.now()
-        
-        # Clean old requests
-        self.clients[client_ip] = [
-            req_time for req_time in self.clients[client_ip]
-            if now - req_time < timedelta(seconds=self.window)
-        ]
-        
-        # Check rate limit
-        if len(self.clients[client_ip]) >= self.requests:
-            logger.warning(f"Rate limit exceeded for {client_ip}")
+        client_ip = request.client.host if request.client else "unknown"
+        allowed, retry_after = await self.check(client_ip)
+        if not allowed:
+            logger.warning("Rate limit exceeded for %s (%s)", client_ip, self.scope)
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Too many requests. Please try again later."
+                detail=RATE_LIMIT_DETAIL,
+                headers={"Retry-After": str(retry_after)}
+            )
+
+class RateLimitMiddleware:
+    # Pure ASGI middleware applying a limiter to every HTTP request except
+    # health checks and Prometheus scrapes
+    def __init__(self, app, limiter: RateLimiter, exempt_paths: Iterable[str] = ("/health", "/metrics")):
+        self.app = app
+        self.limiter = limiter
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        allowed, retry_after = await self.limiter.check(client_ip)
+        if not allowed:
+            logger.warning("Rate limit exceeded for %s", client_ip)
+            response = FastJSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={"detail": RATE_LIMIT_DETAIL},
+                headers={"Retry-After": str(retry_after)}
             )
-        
-        self.clients[client_ip].append(now)
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
 
-rate_limiter = RateLimiter(requests=100, window=60)
+rate_limit_backend = create_backend()
+rate_limiter = RateLimiter(
+    requests=settings.RATE_LIMIT_REQUESTS,
+    window=settings.RATE_LIMIT_WINDOW_SECONDS,
+    backend=rate_limit_backend
+)
+login_rate_limiter = RateLimiter(
+    requests=settings.LOGIN_RATE_LIMIT_REQUESTS,
+    window=settings.RATE_LIMIT_WINDOW_SECONDS,
+    backend=rate_limit_backend,
+    scope="login"
+)
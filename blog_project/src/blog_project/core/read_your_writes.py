@@ -0,0 +1,32 @@
+from typing import Optional
+
+from blog_project.core.config import settings
+from blog_project.db.session import READ_PIN_COOKIE
+
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+class ReadYourWritesMiddleware:
+    # Pure ASGI: after a successful unsafe request, sets a short-lived cookie
+    # that makes get_read_db use the primary, so the client never reads from
+    # a replica that has not caught up with its own write yet.
+    def __init__(self, app, seconds: Optional[int] = None):
+        self.app = app
+        seconds = settings.READ_YOUR_WRITES_SECONDS if seconds is None else seconds
+        self.cookie = (
+            b"set-cookie",
+            f"{READ_PIN_COOKIE}=1; Max-Age={seconds}; Path=/; HttpOnly; SameSite=Lax".encode("latin-1")
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        cookie = self.cookie
+
+        async def send_with_pin(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message["headers"] = [*message.get("headers", ()), cookie]
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
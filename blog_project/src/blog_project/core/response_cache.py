@@ -0,0 +1,66 @@
+from fastapi import Request, Response
+from typing import Dict, Hashable, NamedTuple, Optional
+import hashlib
+
+from blog_project.core.cache import TTLCache
+from blog_project.core.compression import compress, encoded_etag, negotiate, strip_encoding
+from blog_project.core.config import settings
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    # Compressed copies of body by content coding, filled on first request
+    encoded: Dict[str, bytes]
+
+def make_etag(body: bytes) -> str:
+    return '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+
+class ResponseCache(TTLCache):
+    def store(self, key: Hashable, body: bytes, ttl: Optional[float] = None) -> CachedResponse:
+        entry = CachedResponse(body, make_etag(body), {})
+        self.set(key, entry, ttl)
+        return entry
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Validators of compressed variants match the entry they came from
+    return any(strip_encoding(tag.strip().removeprefix("W/")) == etag for tag in header.split(","))
+
+async def cached_json_response(request: Request, entry: CachedResponse) -> Response:
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    encoding = None
+    if settings.COMPRESSION_ENABLED and len(entry.body) >= settings.COMPRESSION_MIN_SIZE:
+        headers["Vary"] = "Accept-Encoding"
+        encoding = negotiate(request.headers.get("accept-encoding", ""))
+        if encoding is not None:
+            headers["ETag"] = encoded_etag(entry.etag, encoding)
+    if etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    if encoding is None:
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    # Compressed once per entry and coding; the middleware passes it through
+    body = entry.encoded.get(encoding)
+    if body is None:
+        body = await compress(entry.body, encoding)
+        entry.encoded[encoding] = body
+    headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Serialized post bodies keyed by post id, and list pages keyed by their
+# query parameters. Per worker; core/post_invalidation.py replays writes made
+# by other workers within POST_CACHE_SYNC_SECONDS.
+post_cache = ResponseCache(maxsize=settings.POST_CACHE_MAX_ENTRIES, ttl=settings.POST_CACHE_TTL_SECONDS)
+post_list_cache = ResponseCache(maxsize=settings.POST_CACHE_MAX_ENTRIES, ttl=settings.POST_CACHE_TTL_SECONDS)
+
+def invalidate_post(post_id: int) -> None:
+    post_cache.pop(post_id)
+    post_list_cache.clear()
+
+def invalidate_all_posts() -> None:
+    post_cache.clear()
+    post_list_cache.clear()
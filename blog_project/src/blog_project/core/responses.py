@@ -0,0 +1,11 @@
+from fastapi.responses import JSONResponse
+from typing import Any
+import orjson
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+class FastJSONResponse(JSONResponse):
+    # Compact UTF-8 output encoded by orjson
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
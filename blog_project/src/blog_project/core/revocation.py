@@ -0,0 +1,95 @@
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+import asyncio
+import logging
+import time
+
+from blog_project.core.config import settings
+from blog_project.db.session import AsyncSessionLocal
+from blog_project.models.models import TokenFamily, TokenRevocation
+
+logger = logging.getLogger(__name__)
+
+# Rows are re-read this far back on every sync, so a revocation whose
+# transaction committed late (or on a host with a slightly different clock)
+# is still picked up. Applying a row twice is harmless.
+SYNC_OVERLAP_SECONDS = 60
+PURGE_INTERVAL_SECONDS = 3600
+
+def _token_lifetime() -> float:
+    # No token issued before a revocation outlives this, so entries older
+    # than it can be forgotten
+    return settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+class RevocationList:
+    # Revoked token families and per-user "not before" times, keyed the way
+    # they appear in token claims (fid, sub). Checking a token is two dict
+    # lookups; each worker mirrors token_revocations every
+    # TOKEN_REVOCATION_SYNC_SECONDS and applies its own revocations at once.
+    def __init__(self):
+        self.families: Dict[str, float] = {}
+        self.users: Dict[str, float] = {}
+        self._synced_until = 0.0
+        self._purged_at = 0.0
+
+    def is_revoked(self, claims: dict) -> bool:
+        family_id = claims.get("fid")
+        if family_id is not None and family_id in self.families:
+            return True
+        not_before = self.users.get(claims.get("sub"))
+        return not_before is not None and claims.get("iat", 0) < not_before
+
+    def apply(self, family_id: Optional[str], user_id: Optional[int], revoked_at: float) -> None:
+        if family_id is not None:
+            self.families[family_id] = revoked_at
+        if user_id is not None:
+            key = str(user_id)
+            self.users[key] = max(self.users.get(key, 0.0), revoked_at)
+
+    def prune(self, now: float) -> None:
+        cutoff = now - _token_lifetime()
+        self.families = {key: at for key, at in self.families.items() if at >= cutoff}
+        self.users = {key: at for key, at in self.users.items() if at >= cutoff}
+
+    async def record(self, db: AsyncSession, family_id: Optional[str] = None, user_ids: Iterable[int] = ()) -> None:
+        # Written in the caller's transaction; applied locally straight away
+        now = time.time()
+        rows = [{"family_id": family_id, "user_id": None, "revoked_at": now}] if family_id is not None else []
+        rows += [{"family_id": None, "user_id": user_id, "revoked_at": now} for user_id in user_ids]
+        if not rows:
+            return
+        await db.execute(insert(TokenRevocation), rows)
+        for row in rows:
+            self.apply(row["family_id"], row["user_id"], now)
+
+    async def sync(self) -> None:
+        started = time.time()
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(TokenRevocation.family_id, TokenRevocation.user_id, TokenRevocation.revoked_at)
+                .where(TokenRevocation.revoked_at >= self._synced_until - SYNC_OVERLAP_SECONDS)
+            )
+            for family_id, user_id, revoked_at in result:
+                self.apply(family_id, user_id, revoked_at)
+            if started - self._purged_at >= PURGE_INTERVAL_SECONDS:
+                await session.execute(
+                    delete(TokenRevocation).where(TokenRevocation.revoked_at < started - _token_lifetime())
+                )
+                await session.execute(delete(TokenFamily).where(TokenFamily.expires_at < datetime.utcnow()))
+                await session.commit()
+                self._purged_at = started
+        self._synced_until = started
+        self.prune(started)
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.TOKEN_REVOCATION_SYNC_SECONDS)
+            try:
+                await self.sync()
+            except SQLAlchemyError:
+                logger.warning("Token revocation sync failed", exc_info=True)
+
+revocations = RevocationList()
@@ -1,32 +1,115 @@
-from passlib.context import CryptContext
+from fastapi import HTTPException, status
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from typing import Optional
+import asyncio
+import logging
+import time
+import uuid
 from blog_project.core.config import settings
+from blog_project.core.revocation import revocations
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+
+# passlib/bcrypt are imported on first use, keeping them off worker startup
+_pwd_context = None
+_hash_executor: Optional[Executor] = None
+_hash_pending = 0
+
+def _get_pwd_context():
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     # Bcrypt has 72 byte limit
-    return pwd_context.verify(plain_password[:72], hashed_password)
+    return _get_pwd_context().verify(plain_password[:72], hashed_password)
 
 def get_password_hash(password: str) -> str:
     # Bcrypt has 72 byte limit
-    return pwd_context.hash(password[:72])
+    return _get_pwd_context().hash(password[:72])
+
+def _get_hash_executor() -> Executor:
+    global _hash_executor
+    if _hash_executor is None:
+        if settings.PASSWORD_HASH_EXECUTOR == "process":
+            _hash_executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+        else:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="bcrypt"
+            )
+    return _hash_executor
+
+async def _run_in_hash_pool(func, *args):
+    # The pool size caps concurrent bcrypt work; anything beyond the queue
+    # limit is shed so a login storm cannot pile up behind the event loop.
+    global _hash_pending
+    if _hash_pending >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE:
+        logger.warning("Password hashing queue full, shedding request")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy. Please try again shortly.",
+            headers={"Retry-After": "1"}
+        )
+    _hash_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), func, *args)
+    finally:
+        _hash_pending -= 1
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_hash_pool(get_password_hash, password)
+
+def shutdown_hash_executor() -> None:
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=True)
+        _hash_executor = None
+
+def new_token_id() -> str:
+    return uuid.uuid4().hex
+
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None, family_id: Optional[str] = None) -> str:
+    # family_id ties the token to its login session, so logging out revokes
+    # it along with the session's refresh token
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    # iat with sub-second precision, compared against revocation times
+    to_encode.update({"exp": expire, "iat": round(time.time(), 3), "typ": "access"})
+    if family_id is not None:
+        to_encode["fid"] = family_id
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str) -> Optional[dict]:
+def create_refresh_token(user_id: int, family_id: str, jti: str) -> str:
+    to_encode = {
+        "sub": str(user_id),
+        "fid": family_id,
+        "jti": jti,
+        "typ": "refresh",
+        "iat": round(time.time(), 3),
+        "exp": datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    }
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
+    # Signature, expiry and type, then the in-memory denylist; no database
+    # access. Tokens issued before "typ" existed count as access tokens.
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
+    if payload.get("typ", "access") != token_type or revocations.is_revoked(payload):
+        return None
+    return payload
@@ -1,17 +1,74 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        
-        # Security headers (Uncomment for production)
-        # response.headers["X-Content-Type-Options"] = "nosniff"
-        # response.headers["X-Frame-Options"] = "DENY"
-        # response.headers["X-XSS-Protection"] = "1; mode=block"
-        # response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        # response.headers["Content-Security-Policy"] = "default-src 'self'"
-        # response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        # response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-        
-        return response
+from typing import Dict, List, Optional, Tuple
+
+from blog_project.core.config import settings
+
+SECURITY_HEADER_PROFILES: Dict[str, Dict[str, str]] = {
+    "off": {},
+    # Safe everywhere, including the Swagger UI served from a CDN
+    "basic": {
+        "X-Content-Type-Options": "nosniff",
+        "X-Frame-Options": "DENY",
+        "Referrer-Policy": "strict-origin-when-cross-origin",
+        "Permissions-Policy": "geolocation=(), microphone=(), camera=()",
+    },
+    "strict": {
+        "X-Content-Type-Options": "nosniff",
+        "X-Frame-Options": "DENY",
+        "X-XSS-Protection": "1; mode=block",
+        "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+        "Content-Security-Policy": "default-src 'self'",
+        "Referrer-Policy": "strict-origin-when-cross-origin",
+        "Permissions-Policy": "geolocation=(), microphone=(), camera=()",
+    },
+}
+
+# FastAPI's Swagger UI and ReDoc pages load their scripts, styles and fonts
+# from CDNs and start with an inline script, which "default-src 'self'"
+# blocks. Only these pages get a policy that allows them; they render no
+# user content.
+DOCS_PATHS = frozenset(("/docs", "/docs/oauth2-redirect", "/redoc"))
+DOCS_CONTENT_SECURITY_POLICY = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+    "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net https://fonts.googleapis.com; "
+    "font-src 'self' https://fonts.gstatic.com; "
+    "img-src 'self' data: https://fastapi.tiangolo.com https://cdn.redoc.ly; "
+    "worker-src 'self' blob:"
+)
+
+def build_header_block(profile: str, docs: bool = False) -> List[Tuple[bytes, bytes]]:
+    if profile not in SECURITY_HEADER_PROFILES:
+        raise ValueError(f"Unknown security headers profile: {profile}")
+    headers = SECURITY_HEADER_PROFILES[profile]
+    if docs and "Content-Security-Policy" in headers:
+        headers = {**headers, "Content-Security-Policy": DOCS_CONTENT_SECURITY_POLICY}
+    return [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in headers.items()
+    ]
+
+class SecurityHeadersMiddleware:
+    # Pure ASGI: appends a header block built once at startup to every
+    # response start message, without wrapping or buffering the body.
+    def __init__(self, app, profile: Optional[str] = None):
+        self.app = app
+        if profile is None:
+            profile = settings.SECURITY_HEADERS_PROFILE or (
+                "strict" if settings.ENVIRONMENT == "production" else "off"
+            )
+        self.raw_headers = build_header_block(profile)
+        self.docs_headers = build_header_block(profile, docs=True)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.raw_headers:
+            await self.app(scope, receive, send)
+            return
+
+        raw_headers = self.docs_headers if scope["path"] in DOCS_PATHS else self.raw_headers
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *raw_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
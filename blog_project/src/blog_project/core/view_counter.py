@@ -0,0 +1,84 @@
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict
+import asyncio
+import logging
+
+from blog_project.core.config import settings
+from blog_project.db.dialects import dialect_insert
+from blog_project.db.session import AsyncSessionLocal
+from blog_project.models.models import Post, PostView
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT ... VALUES; two bound parameters each keeps SQLite well
+# under its variable limit
+UPSERT_CHUNK_SIZE = 400
+
+async def upsert_view_counts(db: AsyncSession, counts: Dict[int, int]) -> None:
+    items = list(counts.items())
+    for start in range(0, len(items), UPSERT_CHUNK_SIZE):
+        stmt = dialect_insert(db, PostView).values([
+            {"post_id": post_id, "views": views} for post_id, views in items[start:start + UPSERT_CHUNK_SIZE]
+        ])
+        # Additive, so flushes from several workers never overwrite each other
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PostView.post_id],
+            set_={"views": PostView.views + stmt.excluded.views}
+        )
+        await db.execute(stmt)
+
+class ViewCounter:
+    # Per-worker view increments, written behind in batched upserts. Only the
+    # event loop touches `pending`, so record() is a plain dict update.
+    def __init__(self):
+        self.pending: Dict[int, int] = {}
+        self.flushed_total = 0
+
+    def record(self, post_id: int) -> None:
+        self.pending[post_id] = self.pending.get(post_id, 0) + 1
+
+    def _restore(self, counts: Dict[int, int]) -> None:
+        for post_id, views in counts.items():
+            self.pending[post_id] = self.pending.get(post_id, 0) + views
+
+    async def flush(self) -> int:
+        if not self.pending:
+            return 0
+        counts, self.pending = self.pending, {}
+        try:
+            async with AsyncSessionLocal() as session:
+                try:
+                    await upsert_view_counts(session, counts)
+                    await session.commit()
+                except IntegrityError:
+                    # A post was deleted since it was viewed; keep the rest
+                    await session.rollback()
+                    existing = set(await session.scalars(select(Post.id).where(Post.id.in_(counts))))
+                    counts = {post_id: views for post_id, views in counts.items() if post_id in existing}
+                    await upsert_view_counts(session, counts)
+                    await session.commit()
+        except BaseException:
+            # Retried with the next flush; also covers cancellation mid-write,
+            # so the final flush at shutdown still has these counts
+            self._restore(counts)
+            raise
+        self.flushed_total += sum(counts.values())
+        return len(counts)
+
+    async def run(self, stopping: asyncio.Event) -> None:
+        # Ended by setting `stopping` rather than by cancel(), so a flush in
+        # progress finishes its write first
+        while True:
+            try:
+                await asyncio.wait_for(stopping.wait(), settings.VIEW_FLUSH_INTERVAL_SECONDS)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except SQLAlchemyError:
+                logger.warning("View count flush failed; %s posts pending", len(self.pending), exc_info=True)
+
+view_counter = ViewCounter()
@@ -0,0 +1,113 @@
+from fastapi import HTTPException, status
+from sqlalchemy import RowMapping, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta
+from typing import Optional
+
+from blog_project.db import search
+from blog_project.db.dialects import dialect_insert
+from blog_project.core.config import settings
+from blog_project.models.models import Post, TokenFamily, User, UserRole
+
+# Single-statement write paths. Each function runs one conditional
+# INSERT/UPDATE/DELETE ... RETURNING and leaves the commit to the caller.
+
+# Columns of PostResponse
+POST_COLUMNS = (Post.title, Post.content, Post.published, Post.id, Post.created_at, Post.author_id)
+USER_COLUMNS = (User.id, User.email, User.is_active, User.role)
+
+async def _ownership_error(db: AsyncSession, post_id: int, action: str) -> HTTPException:
+    # Only reached when the conditional statement matched nothing
+    if await db.scalar(select(Post.author_id).where(Post.id == post_id)) is None:
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+    return HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Not authorized to {action} this post")
+
+async def create_post(db: AsyncSession, author_id: int, title: str, content: str, published: bool) -> RowMapping:
+    result = await db.execute(
+        insert(Post)
+        .values(title=title, content=content, published=published, author_id=author_id)
+        .returning(*POST_COLUMNS)
+    )
+    post = result.mappings().one()
+    await search.index_posts(db, [(post["id"], title, content)])
+    return post
+
+async def update_own_post(db: AsyncSession, post_id: int, author_id: int, title: str, content: str, published: bool) -> RowMapping:
+    result = await db.execute(
+        update(Post)
+        .where(Post.id == post_id, Post.author_id == author_id)
+        .values(title=title, content=content, published=published)
+        .returning(*POST_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    post = result.mappings().one_or_none()
+    if post is None:
+        raise await _ownership_error(db, post_id, "update")
+    await search.index_posts(db, [(post_id, title, content)])
+    return post
+
+async def delete_own_post(db: AsyncSession, post_id: int, author_id: int) -> None:
+    result = await db.execute(
+        delete(Post)
+        .where(Post.id == post_id, Post.author_id == author_id)
+        .returning(Post.id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.scalar_one_or_none() is None:
+        raise await _ownership_error(db, post_id, "delete")
+    await search.remove_posts(db, [post_id])
+
+async def create_user(db: AsyncSession, email: str, password_hash: str, role: UserRole) -> Optional[RowMapping]:
+    # None when the email is already registered; the unique index decides,
+    # so concurrent signups cannot both succeed
+    stmt = dialect_insert(db, User).values(
+        email=email,
+        password_hash=password_hash,
+        is_active=True,
+        role=role
+    )
+    result = await db.execute(
+        stmt.on_conflict_do_nothing(index_elements=[User.email]).returning(*USER_COLUMNS)
+    )
+    return result.mappings().one_or_none()
+
+def _family_expiry() -> datetime:
+    return datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+async def create_token_family(db: AsyncSession, family_id: str, user_id: int, jti: str) -> None:
+    await db.execute(insert(TokenFamily).values(
+        id=family_id,
+        user_id=user_id,
+        current_jti=jti,
+        expires_at=_family_expiry(),
+        revoked=False
+    ))
+
+async def rotate_token_family(db: AsyncSession, family_id: str, user_id: int, jti: str, new_jti: str) -> bool:
+    # Succeeds only for the family's current refresh token; False means the
+    # token was already rotated (replayed) or the family is revoked or gone
+    result = await db.execute(
+        update(TokenFamily)
+        .where(
+            TokenFamily.id == family_id,
+            TokenFamily.user_id == user_id,
+            TokenFamily.current_jti == jti,
+            TokenFamily.revoked.is_(False),
+            TokenFamily.expires_at > datetime.utcnow()
+        )
+        .values(current_jti=new_jti, expires_at=_family_expiry())
+        .returning(TokenFamily.id)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one_or_none() is not None
+
+async def revoke_token_family(db: AsyncSession, family_id: str) -> bool:
+    # True if this call revoked it
+    result = await db.execute(
+        update(TokenFamily)
+        .where(TokenFamily.id == family_id, TokenFamily.revoked.is_(False))
+        .values(revoked=True)
+        .returning(TokenFamily.id)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one_or_none() is not None
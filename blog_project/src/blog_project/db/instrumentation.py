@@ -0,0 +1,150 @@
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+import time
+
+from blog_project.core.config import settings
+
+class PoolStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.in_use_max = 0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_total += seconds
+        if seconds > self.wait_max:
+            self.wait_max = seconds
+
+    def snapshot(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+            "in_use_max": self.in_use_max,
+        }
+
+class StatementStats:
+    # Latency per distinct SQL string. Bounded: once max_statements are
+    # tracked, new statements are folded into a single "<other>" bucket.
+    def __init__(self, max_statements: int = 200):
+        self.max_statements = max_statements
+        self._stats: Dict[str, List[float]] = {}
+
+    def reset(self) -> None:
+        self._stats.clear()
+
+    def record(self, statement: str, seconds: float) -> None:
+        stats = self._stats.get(statement)
+        if stats is None:
+            if len(self._stats) >= self.max_statements:
+                statement = "<other>"
+                stats = self._stats.get(statement)
+            if stats is None:
+                stats = self._stats[statement] = [0, 0.0, 0.0]
+        stats[0] += 1
+        stats[1] += seconds
+        if seconds > stats[2]:
+            stats[2] = seconds
+
+    def top(self, limit: int = 20) -> List[dict]:
+        ranked = sorted(self._stats.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [
+            {
+                "statement": statement,
+                "count": count,
+                "total_ms": round(total * 1000, 3),
+                "avg_ms": round(total / count * 1000, 3),
+                "max_ms": round(slowest * 1000, 3),
+            }
+            for statement, (count, total, slowest) in ranked
+        ]
+
+class RequestQueryStats:
+    # Queries issued while handling one request; see core.query_timing
+    __slots__ = ("count", "duration", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Dict[str, int] = {}
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.duration += seconds
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        return [(statement, count) for statement, count in self.statements.items() if count >= threshold]
+
+current_query_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("current_query_stats", default=None)
+
+pool_stats = PoolStats()
+statement_stats = StatementStats(max_statements=settings.DB_STATEMENT_STATS_MAX)
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    # Times how long each checkout waits for a free connection
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            pool_stats.timeouts += 1
+            raise
+        finally:
+            pool_stats.record_wait(time.perf_counter() - start)
+
+# The start time lives on the execution context, not on the connection:
+# after_cursor_execute does not run when a statement raises, and anything
+# left on the pooled connection would outlive the statement.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.query_start_time = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "query_start_time", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    statement_stats.record(statement, elapsed)
+    request_stats = current_query_stats.get()
+    if request_stats is not None:
+        request_stats.record(statement, elapsed)
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    pool = sync_engine.pool
+
+    if hasattr(pool, "checkedout"):
+        @event.listens_for(pool, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+            in_use = pool.checkedout()
+            if in_use > pool_stats.in_use_max:
+                pool_stats.in_use_max = in_use
+
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+def pool_status(engine: AsyncEngine) -> dict:
+    pool = engine.sync_engine.pool
+    status = {"class": type(pool).__name__}
+    if hasattr(pool, "checkedout"):
+        status.update(
+            size=pool.size(),
+            in_use=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(0, pool.overflow()),
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            timeout=pool.timeout(),
+        )
+    return status
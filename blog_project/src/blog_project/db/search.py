@@ -0,0 +1,108 @@
+from sqlalchemy import Select, column, delete, func, literal_column, select, table, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from typing import Iterable, List, Optional, Tuple
+import re
+
+from blog_project.models.models import Post
+
+# Postgres keeps a weighted tsvector in a generated column, so the database
+# maintains it inside the same INSERT/UPDATE. SQLite (local runs and tests)
+# uses an FTS5 table keyed by post id that the write paths keep in sync.
+POSTGRES_DDL = [
+    "ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'B')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_posts_search_vector ON posts USING GIN (search_vector)",
+]
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(title, content, tokenize='porter unicode61')",
+]
+
+posts_fts = table("posts_fts", column("rowid"))
+
+def _dialect(db: AsyncSession) -> str:
+    return db.get_bind().dialect.name
+
+async def ensure_search_index(conn: AsyncConnection) -> None:
+    if conn.dialect.name == "postgresql":
+        statements = POSTGRES_DDL
+    elif conn.dialect.name == "sqlite":
+        statements = SQLITE_DDL
+    else:
+        return
+    for statement in statements:
+        await conn.execute(text(statement))
+
+async def index_posts(db: AsyncSession, posts: Iterable[Tuple[int, str, str]]) -> None:
+    # (id, title, content) rows; call inside the writing transaction
+    if _dialect(db) != "sqlite":
+        return
+    rows = [{"id": id, "title": title, "content": content} for id, title, content in posts]
+    if not rows:
+        return
+    await db.execute(text("DELETE FROM posts_fts WHERE rowid = :id"), rows)
+    await db.execute(text("INSERT INTO posts_fts (rowid, title, content) VALUES (:id, :title, :content)"), rows)
+
+async def index_post(db: AsyncSession, post: Post) -> None:
+    await index_posts(db, [(post.id, post.title, post.content)])
+
+async def remove_posts(db: AsyncSession, post_ids: Iterable[int]) -> None:
+    if _dialect(db) != "sqlite":
+        return
+    rows = [{"id": post_id} for post_id in post_ids]
+    if rows:
+        await db.execute(text("DELETE FROM posts_fts WHERE rowid = :id"), rows)
+
+async def remove_matching_posts(db: AsyncSession, post_ids: Select) -> None:
+    # post_ids selects the ids of posts about to be deleted; one statement
+    # however many posts match
+    if _dialect(db) != "sqlite":
+        return
+    await db.execute(delete(posts_fts).where(posts_fts.c.rowid.in_(post_ids)))
+
+async def remove_author_posts(db: AsyncSession, author_id: int) -> None:
+    await remove_matching_posts(db, select(Post.id).where(Post.author_id == author_id))
+
+def _fts5_query(q: str) -> Optional[str]:
+    # Quote every word so user input cannot inject FTS5 operators
+    terms = re.findall(r"\w+", q)
+    return " ".join(f'"{term}"' for term in terms) if terms else None
+
+async def search_posts(
+    db: AsyncSession,
+    q: str,
+    limit: int,
+    after: Optional[Tuple[float, int]] = None
+) -> List[Tuple[Post, float]]:
+    # Published posts matching q, best match first (ties broken by id).
+    # `after` is the (score, id) of the last row of the previous page.
+    if _dialect(db) == "postgresql":
+        ts_query = func.websearch_to_tsquery("english", q)
+        vector = literal_column("posts.search_vector")
+        ranked = (
+            select(Post.id.label("post_id"), func.ts_rank_cd(vector, ts_query).label("score"))
+            .where(vector.op("@@")(ts_query), Post.published.is_(True))
+            .subquery()
+        )
+    else:
+        match = _fts5_query(q)
+        if match is None:
+            return []
+        # bm25() is lower-is-better; negate so both backends sort descending
+        ranked = (
+            select(posts_fts.c.rowid.label("post_id"), (-func.bm25(literal_column("posts_fts"), 10.0, 1.0)).label("score"))
+            .where(literal_column("posts_fts").op("MATCH")(match))
+            .subquery()
+        )
+
+    query = (
+        select(Post, ranked.c.score)
+        .join(ranked, ranked.c.post_id == Post.id)
+        .where(Post.published.is_(True))
+        .order_by(ranked.c.score.desc(), Post.id.desc())
+        .limit(limit)
+    )
+    if after is not None:
+        query = query.where(tuple_(ranked.c.score, Post.id) < after)
+    result = await db.execute(query)
+    return [(post, score) for post, score in result.all()]
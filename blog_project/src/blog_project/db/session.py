@@ -1,11 +1,48 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.exc import SQLAlchemyError
+from typing import List, Optional
+import logging
+import time
+
 from blog_project.core.config import settings
+from blog_project.db.instrumentation import InstrumentedPool, instrument_engine
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=False,
-    future=True
-)
+def engine_options(url: str) -> dict:
+    options = {"echo": False, "future": True}
+    if ":memory:" in url:
+        # In-memory SQLite needs its single-connection pool
+        return options
+    options.update(
+        poolclass=InstrumentedPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return options
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record) -> None:
+    # SQLite ignores foreign keys, and so ON DELETE CASCADE, unless every
+    # connection turns them on
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+def build_engine(url: str) -> AsyncEngine:
+    built = create_async_engine(url, **engine_options(url))
+    instrument_engine(built)
+    if built.dialect.name == "sqlite":
+        event.listen(built.sync_engine, "connect", _enable_sqlite_foreign_keys)
+    return built
+
+logger = logging.getLogger(__name__)
+
+engine = build_engine(settings.DATABASE_URL)
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -19,4 +56,86 @@ async def get_db():
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+# Read replicas. Handlers that only read opt in with Depends(get_read_db);
+# everything else, including authentication, stays on the primary.
+
+READ_PIN_COOKIE = "db_pin"
+
+class ReplicaSet:
+    # Round-robin over replica engines. A replica that cannot be reached is
+    # skipped for REPLICA_RETRY_SECONDS, and reads fall back to the primary
+    # when none is available.
+    def __init__(self, urls: List[str]):
+        self.engines: List[AsyncEngine] = []
+        for url in urls:
+            self.engines.append(build_engine(url))
+        self.sessionmakers = [
+            async_sessionmaker(bind=replica_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+            for replica_engine in self.engines
+        ]
+        self.down_until = [0.0] * len(self.engines)
+        self._next = 0
+
+    def _candidates(self) -> List[int]:
+        now = time.monotonic()
+        count = len(self.engines)
+        start = self._next
+        self._next = (start + 1) % count
+        return [
+            index for index in ((start + offset) % count for offset in range(count))
+            if self.down_until[index] <= now
+        ]
+
+    def mark_down(self, index: int, exc: Exception) -> None:
+        self.down_until[index] = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+        url = self.engines[index].url.render_as_string(hide_password=True)
+        logger.warning("Read replica %s unavailable, using others for %ss: %s", url, settings.REPLICA_RETRY_SECONDS, exc)
+
+    async def session(self) -> AsyncSession:
+        for index in self._candidates():
+            session = self.sessionmakers[index]()
+            try:
+                # Connect up front so an unreachable replica is detected here
+                await session.connection()
+                return session
+            except (SQLAlchemyError, OSError) as exc:
+                await session.close()
+                self.mark_down(index, exc)
+        return AsyncSessionLocal()
+
+    def status(self) -> List[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "url": replica_engine.url.render_as_string(hide_password=True),
+                "healthy": self.down_until[index] <= now,
+                "retry_in": round(max(0.0, self.down_until[index] - now), 1),
+            }
+            for index, replica_engine in enumerate(self.engines)
+        ]
+
+_replica_urls = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+replicas: Optional[ReplicaSet] = ReplicaSet(_replica_urls) if _replica_urls else None
+
+async def open_read_session() -> AsyncSession:
+    return await replicas.session() if replicas is not None else AsyncSessionLocal()
+
+def is_primary(session: AsyncSession) -> bool:
+    return session.bind is engine
+
+def read_pinned(request: Request) -> bool:
+    # Clients that wrote recently carry the pin cookie (see
+    # ReadYourWritesMiddleware) and read from the primary until it expires.
+    return replicas is not None and READ_PIN_COOKIE in request.cookies
+
+async def get_read_db(request: Request):
+    if replicas is None or read_pinned(request):
+        session = AsyncSessionLocal()
+    else:
+        session = await replicas.session()
+    try:
+        yield session
+    finally:
+        await session.close()
@@ -1,11 +1,17 @@
+import time
+# Taken before the framework imports so worker start time includes them
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import os
 
 from blog_project.core.config import settings
-from blog_project.db.session import engine
-from blog_project.db.base import Base
+from blog_project.core.logging_config import setup_logging
 from blog_project.api import routes, users, auth, admin, user_profile
 from blog_project.core.exceptions import (
     validation_exception_handler,
@@ -13,52 +19,99 @@ from blog_project.core.exceptions import (
     general_exception_handler
 )
 from blog_project.core.security_headers import SecurityHeadersMiddleware
+from blog_project.core.compression import CompressionMiddleware, shutdown_compression_executor
+from blog_project.core.rate_limit import RateLimitMiddleware, rate_limiter
+from blog_project.core.query_timing import QueryTimingMiddleware
+from blog_project.core.profiling import ProfilingMiddleware
+from blog_project.core.responses import FastJSONResponse
+from blog_project.core.read_your_writes import ReadYourWritesMiddleware
+from blog_project.db.session import replicas
+from blog_project.core.view_counter import view_counter
+from blog_project.core.revocation import revocations
+from blog_project.core.post_invalidation import post_invalidations
+from blog_project.core.metrics import MetricsMiddleware, collect, render_prometheus, run_snapshot_writer
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+setup_logging()
 logger = logging.getLogger(__name__)
 
-# Auto-create tables on startup (For Dev only)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    from blog_project.models.models import User, UserRole
-    from blog_project.core.security import get_password_hash
-    from blog_project.db.session import AsyncSessionLocal
-    from sqlalchemy import select
-    
-    logger.info("Creating tables...")
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    from blog_project.core.security import shutdown_hash_executor
+
+    # No-op unless logging was shut down since the module was imported
+    setup_logging()
+    started = time.perf_counter()
+    if settings.BOOTSTRAP_ON_STARTUP:
+        # Dev convenience; deployments run blog_project.bootstrap once instead
+        from blog_project.bootstrap import bootstrap
+        await bootstrap()
     
-    # Create default admin if not exists
-    async with AsyncSessionLocal() as session:
-        result = await session.execute(select(User).where(User.email == settings.ADMIN_EMAIL))
-        if not result.scalar_one_or_none():
-            admin = User(
-                email=settings.ADMIN_EMAIL,
-                password_hash=get_password_hash(settings.ADMIN_PASSWORD),
-                is_active=True,
-                role=UserRole.ADMIN
-            )
-            session.add(admin)
-            await session.commit()
-            logger.info(f"Default admin created: {settings.ADMIN_EMAIL}")
+    # Load the token denylist before serving, then follow other workers' revocations
+    try:
+        await revocations.sync()
+    except SQLAlchemyError:
+        logger.error("Initial token revocation sync failed", exc_info=True)
+    revocation_sync = asyncio.create_task(revocations.run())
+    # Other workers' post writes clear this worker's response caches
+    try:
+        await post_invalidations.sync()
+    except SQLAlchemyError:
+        logger.error("Initial post cache invalidation sync failed", exc_info=True)
+    invalidation_sync = asyncio.create_task(post_invalidations.run())
+
+    metrics_writer = None
+    if settings.METRICS_ENABLED and settings.METRICS_MULTIPROC_DIR:
+        metrics_writer = asyncio.create_task(run_snapshot_writer())
+    view_flusher = None
+    views_stopping = asyncio.Event()
+    if settings.VIEW_COUNTS_ENABLED:
+        view_flusher = asyncio.create_task(view_counter.run(views_stopping))
     
+    now = time.perf_counter()
+    logger.info("Worker %s ready in %.0f ms (startup %.0f ms)",
+                os.getpid(), (now - _import_started) * 1000, (now - started) * 1000)
     yield
 
+    revocation_sync.cancel()
+    invalidation_sync.cancel()
+    if metrics_writer is not None:
+        metrics_writer.cancel()
+    if view_flusher is not None:
+        # Not cancelled: that could interrupt a flush mid-write
+        views_stopping.set()
+        await view_flusher
+        # Final flush so views counted since the last interval are kept
+        try:
+            await view_counter.flush()
+        except SQLAlchemyError:
+            logger.error("Final view count flush failed; %s posts lost", len(view_counter.pending), exc_info=True)
+    shutdown_hash_executor()
+    shutdown_compression_executor()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
+# Response compression (innermost, so only handler output is buffered)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 # Security Headers
 app.add_middleware(SecurityHeadersMiddleware)
 
+# Pin clients to the primary for a few seconds after they write
+if replicas is not None and settings.READ_YOUR_WRITES_SECONDS > 0:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Global per-IP rate limit
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
@@ -68,6 +121,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request query counts in Server-Timing, and opt-in admin profiling
+if settings.get_query_timing_enabled:
+    app.add_middleware(QueryTimingMiddleware)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Request metrics (outermost, so the timing covers every other middleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Exception Handlers
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(SQLAlchemyError, sqlalchemy_exception_handler)
@@ -90,4 +153,9 @@ async def health_check():
         "status": "healthy",
         "environment": settings.ENVIRONMENT,
         "version": settings.VERSION
-    }
\ No newline at end of file
+    }
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(render_prometheus(collect()), media_type="text/plain; version=0.0.4")
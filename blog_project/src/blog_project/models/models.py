@@ -2,7 +2,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import List, Optional
 from blog_project.db.base import Base
 from datetime import datetime
-from sqlalchemy import String, Text, ForeignKey, DateTime, Boolean, Enum
+from sqlalchemy import BigInteger, String, Text, ForeignKey, DateTime, Boolean, Enum, Float, Index
 import enum
 
 class UserRole(str, enum.Enum):
@@ -19,7 +19,11 @@ class User(Base):
     role: Mapped[UserRole] = mapped_column(Enum(UserRole), default=UserRole.USER)
 
     # Relationship to Post
-    posts: Mapped[List["Post"]] = relationship("Post", back_populates="author", cascade="all, delete-orphan")
+    # The database deletes a user's posts (ON DELETE CASCADE); passive_deletes
+    # stops the ORM from loading them just to delete them one by one
+    posts: Mapped[List["Post"]] = relationship(
+        "Post", back_populates="author", cascade="all, delete-orphan", passive_deletes=True
+    )
     
 
 class Post(Base):
@@ -31,5 +35,69 @@ class Post(Base):
     published: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     
-    author_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
-    author: Mapped["User"] = relationship("User", back_populates="posts")
\ No newline at end of file
+    author_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    author: Mapped["User"] = relationship("User", back_populates="posts")
+
+    __table_args__ = (
+        # Author feeds seek on author_id and walk (created_at, id) in order;
+        # also covers the author_id foreign key lookups
+        Index("ix_posts_author_id_created_at_id", "author_id", "created_at", "id"),
+    )
+
+# The public listing only shows published posts, so its keyset index leaves
+# drafts out. Queries must filter on Post.published.is_(True), the same
+# expression, for the planner to pick it.
+Index(
+    "ix_posts_published_created_at_id",
+    Post.created_at,
+    Post.id,
+    postgresql_where=Post.published.is_(True),
+    sqlite_where=Post.published.is_(True)
+)
+
+class PostView(Base):
+    # View counts live outside posts so the frequent counter upserts do not
+    # rewrite post rows (and their search vectors)
+    __tablename__ = "post_views"
+
+    post_id: Mapped[int] = mapped_column(ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    views: Mapped[int] = mapped_column(BigInteger, default=0)
+
+    __table_args__ = (
+        # /posts/popular walks this index from the top instead of sorting
+        Index("ix_post_views_views_post_id", "views", "post_id"),
+    )
+
+class TokenFamily(Base):
+    # One per login session. Each refresh rotates current_jti; presenting an
+    # older refresh token of the family means it was replayed, and the
+    # whole family is revoked.
+    __tablename__ = "token_families"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    current_jti: Mapped[str] = mapped_column(String(32))
+    expires_at: Mapped[datetime] = mapped_column(DateTime)
+    revoked: Mapped[bool] = mapped_column(Boolean, default=False)
+
+class TokenRevocation(Base):
+    # Append-only log every worker mirrors into its in-memory denylist: a
+    # revoked token family, or a user whose tokens issued before revoked_at
+    # are invalid. Rows older than the refresh token lifetime are purged.
+    __tablename__ = "token_revocations"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    family_id: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    user_id: Mapped[Optional[int]] = mapped_column(nullable=True)
+    # Unix time, comparable with the tokens' iat claim
+    revoked_at: Mapped[float] = mapped_column(Float, index=True)
+
+class PostInvalidation(Base):
+    # Append-only log of post writes that every worker replays against its
+    # response caches: one post (post_id) or all posts (NULL). Rows are only
+    # needed for a few sync intervals and are purged after an hour.
+    __tablename__ = "post_invalidations"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    post_id: Mapped[Optional[int]] = mapped_column(nullable=True)
+    invalidated_at: Mapped[float] = mapped_column(Float, index=True)
@@ -1,6 +1,8 @@
-from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
-from datetime import datetime
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, TypeAdapter, field_validator, model_validator
+from typing_extensions import TypedDict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
 from enum import Enum
 
 class UserRole(str, Enum):
@@ -8,7 +10,8 @@ class UserRole(str, Enum):
     USER = "user"
 
 class PostBase(BaseModel):
-    title: str
+    # posts.title is VARCHAR(200)
+    title: str = Field(..., max_length=200)
     content: str
     published: bool = True
 
@@ -22,6 +25,72 @@ class PostResponse(PostBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class PopularPost(PostResponse):
+    views: int
+
+class PostPage(BaseModel):
+    total: int
+    skip: int
+    limit: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    data: List[PostResponse]
+
+class AuthorPostPage(BaseModel):
+    author_id: int
+    limit: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    data: List[PostResponse]
+
+class PostSearchPage(BaseModel):
+    q: str
+    limit: int
+    next_cursor: Optional[str] = None
+    data: List[PostResponse]
+
+# Plain-dict mirrors of PostResponse/PostPage. Rows selected as mappings are
+# dumped straight to JSON by pydantic-core, skipping model validation.
+class PostRow(TypedDict):
+    title: str
+    content: str
+    published: bool
+    id: int
+    created_at: datetime
+    author_id: Optional[int]
+
+class PostPageData(TypedDict):
+    total: int
+    skip: int
+    limit: int
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+    data: List[PostRow]
+
+post_page_adapter = TypeAdapter(PostPageData)
+
+# Every field a list page can select; "excerpt" is the start of content
+POST_FIELD_TYPES = {**PostRow.__annotations__, "excerpt": str}
+
+@lru_cache(maxsize=None)
+def post_page_adapter_for(fields: Tuple[str, ...]) -> TypeAdapter:
+    # Page adapter for one field set, built on first use. Row keys outside
+    # the set are dropped when dumping, with no per-row validation.
+    if set(fields) == set(PostRow.__annotations__):
+        return post_page_adapter
+    row = TypedDict("PostRow_" + "_".join(fields), {name: POST_FIELD_TYPES[name] for name in fields})
+    page = TypedDict("PostPage_" + "_".join(fields), {**PostPageData.__annotations__, "data": List[row]})
+    return TypeAdapter(page)
+
+class BulkPostError(BaseModel):
+    index: int
+    errors: List[Any]
+
+class BulkPostResult(BaseModel):
+    inserted: int
+    ids: List[int]
+    errors: List[BulkPostError]
+
 class UserCreate(BaseModel):
     email: EmailStr
     password: str
@@ -51,6 +120,10 @@ class UserResponse(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 class LoginRequest(BaseModel):
     email: EmailStr
@@ -58,4 +131,36 @@ class LoginRequest(BaseModel):
 
 class PasswordChange(BaseModel):
     old_password: str
-    new_password: str
\ No newline at end of file
+    new_password: str
+# Admin bulk operations. Every given criterion must match; at least one is
+# required so an empty body cannot select every row.
+MAX_BULK_IDS = 10000
+
+class BulkSelection(BaseModel):
+    ids: Optional[List[int]] = Field(None, max_length=MAX_BULK_IDS)
+
+    @model_validator(mode="after")
+    def require_criteria(self):
+        if all(value is None for value in self.__dict__.values()):
+            raise ValueError("At least one selection criterion is required")
+        return self
+
+class UserSelection(BulkSelection):
+    role: Optional[UserRole] = None
+    is_active: Optional[bool] = None
+
+class PostSelection(BulkSelection):
+    author_ids: Optional[List[int]] = Field(None, max_length=MAX_BULK_IDS)
+    published: Optional[bool] = None
+    created_before: Optional[datetime] = None
+
+    @field_validator("created_before")
+    @classmethod
+    def to_naive_utc(cls, v: Optional[datetime]) -> Optional[datetime]:
+        # created_at is stored as naive UTC
+        if v is not None and v.tzinfo is not None:
+            v = v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
+
+class BulkActionResult(BaseModel):
+    affected: int
@@ -0,0 +1,207 @@
+from typing import Dict, Set
+import importlib.util
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from blog_project.core.config import settings
+from blog_project.core.logging_config import setup_logging, shutdown_logging
+from blog_project.core.metrics import clear_snapshots, retire_snapshot
+
+logger = logging.getLogger(__name__)
+
+APP = "blog_project.main:app"
+
+# A worker that dies sooner than this after starting counts as a crash at
+# startup; restarts back off and the server gives up after a run of them
+MIN_WORKER_LIFETIME_SECONDS = 5
+MAX_STARTUP_FAILURES = 5
+# Extra time past SERVER_GRACEFUL_TIMEOUT_SECONDS for lifespan shutdown
+# (flushing view counts and metrics) before a worker is killed
+SHUTDOWN_MARGIN_SECONDS = 10
+
+def default_workers() -> int:
+    # CPUs this process may run on, which respects container CPU sets
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+def build_config(app) -> uvicorn.Config:
+    return uvicorn.Config(
+        app,
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        loop="uvloop" if _available("uvloop") else "asyncio",
+        http="httptools" if _available("httptools") else "h11",
+        lifespan="on",
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        access_log=settings.SERVER_ACCESS_LOG,
+        forwarded_allow_ips=settings.SERVER_FORWARDED_ALLOW_IPS,
+        # setup_logging() routes uvicorn's loggers through the log queue
+        log_config=None,
+    )
+
+def _serve(config: uvicorn.Config, sock: socket.socket) -> None:
+    # Runs in the forked child. uvicorn installs its own SIGINT/SIGTERM
+    # handlers: stop accepting, drain open requests, run lifespan shutdown.
+    for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD):
+        signal.signal(signum, signal.SIG_DFL)
+    setup_logging()
+    uvicorn.Server(config).run(sockets=[sock])
+
+class Supervisor:
+    # Pre-fork master: binds the socket once, forks the workers, restarts any
+    # that exit unexpectedly. SIGTERM/SIGINT drain every worker and exit;
+    # SIGHUP replaces them one by one without closing the socket.
+    def __init__(self, config: uvicorn.Config, sock: socket.socket, workers: int):
+        self.config = config
+        self.sock = sock
+        self.workers = workers
+        self.children: Dict[int, float] = {}
+        self.retiring: Set[int] = set()
+        self.stopping = False
+        self.reload_requested = False
+        self.startup_failures = 0
+        self.exit_code = 0
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _serve(self.config, self.sock)
+            except SystemExit as exc:
+                # uvicorn exits with status 3 when lifespan startup fails
+                code = exc.code if isinstance(exc.code, int) else 1
+            except BaseException:
+                logger.exception("Worker %s crashed", os.getpid())
+                code = 1
+            finally:
+                shutdown_logging()
+                os._exit(code)
+        self.children[pid] = time.monotonic()
+        logger.info("Started worker %s", pid)
+
+    def kill(self, pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def _handle_stop(self, signum, frame) -> None:
+        self.stopping = True
+
+    def _handle_reload(self, signum, frame) -> None:
+        self.reload_requested = True
+
+    def reap(self) -> None:
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.children.clear()
+                return
+            if pid == 0:
+                return
+            started = self.children.pop(pid, None)
+            if started is None:
+                continue
+            retire_snapshot(pid)
+            if pid in self.retiring:
+                self.retiring.discard(pid)
+                continue
+            if self.stopping:
+                continue
+            logger.warning("Worker %s exited unexpectedly (status %s)", pid, os.waitstatus_to_exitcode(status))
+            if time.monotonic() - started < MIN_WORKER_LIFETIME_SECONDS:
+                self.startup_failures += 1
+                if self.startup_failures >= MAX_STARTUP_FAILURES:
+                    logger.error("Workers keep failing at startup; shutting down")
+                    self.stopping = True
+                    self.exit_code = 1
+                    continue
+                time.sleep(min(self.startup_failures, 5))
+            else:
+                self.startup_failures = 0
+            self.spawn()
+
+    def reload(self) -> None:
+        # Rolling restart: each replacement starts before its predecessor is
+        # asked to drain, so the socket always has workers accepting
+        self.reload_requested = False
+        logger.info("Restarting workers")
+        for pid in list(self.children):
+            if pid in self.retiring:
+                continue
+            self.spawn()
+            self.retiring.add(pid)
+            self.kill(pid, signal.SIGTERM)
+
+    def stop(self) -> None:
+        for pid in self.children:
+            self.kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + settings.SERVER_GRACEFUL_TIMEOUT_SECONDS + SHUTDOWN_MARGIN_SECONDS
+        while self.children and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for pid in self.children:
+            logger.warning("Worker %s did not stop in time; killing it", pid)
+            self.kill(pid, signal.SIGKILL)
+        while self.children:
+            self.reap()
+            time.sleep(0.05)
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+        for _ in range(self.workers):
+            self.spawn()
+        while not self.stopping:
+            self.reap()
+            if self.reload_requested and not self.stopping:
+                self.reload()
+            time.sleep(0.2)
+        logger.info("Shutting down %s workers", len(self.children))
+        self.stop()
+        self.sock.close()
+        return self.exit_code
+
+def main() -> None:
+    # `blog-project` / `python -m blog_project`
+    setup_logging()
+    clear_snapshots()
+    if settings.BOOTSTRAP_ON_STARTUP:
+        # Once here rather than in every worker; the workers inherit the flag
+        from blog_project import bootstrap
+        bootstrap.run_once()
+        settings.BOOTSTRAP_ON_STARTUP = False
+        os.environ["BOOTSTRAP_ON_STARTUP"] = "false"
+
+    app = APP
+    if settings.SERVER_PRELOAD:
+        from blog_project.main import app
+
+    workers = settings.SERVER_WORKERS or default_workers()
+    config = build_config(app)
+    sock = config.bind_socket()
+    logger.info(
+        "Serving on %s:%s with %s workers (loop=%s, http=%s, preload=%s)",
+        settings.SERVER_HOST, settings.SERVER_PORT, workers, config.loop, config.http, settings.SERVER_PRELOAD
+    )
+    try:
+        code = Supervisor(config, sock, workers).run()
+    finally:
+        shutdown_logging()
+    sys.exit(code)
@@ -0,0 +1,80 @@
+from contextlib import closing
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+
+# Settings are read when blog_project is first imported, so the environment
+# has to point at a throwaway SQLite database before that happens
+_tmp_dir = tempfile.mkdtemp(prefix="blog_project_tests_")
+DB_PATH = os.path.join(_tmp_dir, "test.db")
+os.environ.update({
+    "SECRET_KEY": "test-secret-key-0123456789abcdef0123456789abcdef",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_DB": "test",
+    "DATABASE_URL_OVERRIDE": f"sqlite+aiosqlite:///{DB_PATH}",
+    "ADMIN_EMAIL": "admin@example.com",
+    "ADMIN_PASSWORD": "Admin@123456",
+    # The limiter has its own unit tests; here it would only throttle the suite
+    "RATE_LIMIT_ENABLED": "false",
+    # Fast background syncs, so cross-worker effects show up quickly
+    "POST_CACHE_SYNC_SECONDS": "0.2",
+    "TOKEN_REVOCATION_SYNC_SECONDS": "0.2",
+    "LOG_LEVEL": "WARNING",
+    "LOG_FORMAT": "text",
+})
+
+import pytest
+from fastapi.testclient import TestClient
+
+from blog_project.main import app
+
+API = "/api/v1"
+PASSWORD = "Passw0rd!"
+
+@pytest.fixture(scope="session")
+def client():
+    # One app (and lifespan) for the whole run; tests create their own users
+    # and posts rather than relying on a clean database
+    with TestClient(app) as test_client:
+        yield test_client
+
+def login(client: TestClient, email: str, password: str = PASSWORD) -> dict:
+    response = client.post(f"{API}/auth/login", data={"username": email, "password": password})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def auth(tokens: dict) -> dict:
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+def wait_for(condition, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+def write_as_other_worker(*statements) -> None:
+    # Straight to the database file, as a write on another worker or host
+    with closing(sqlite3.connect(DB_PATH)) as conn, conn:
+        for sql, params in statements:
+            conn.execute(sql, params)
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    return auth(login(client, "admin@example.com", "Admin@123456"))
+
+@pytest.fixture
+def new_user(client):
+    email = f"user-{uuid.uuid4().hex[:12]}@example.com"
+    response = client.post(f"{API}/users/", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 201, response.text
+    return {**response.json(), "password": PASSWORD}
+
+@pytest.fixture
+def user_headers(client, new_user):
+    return auth(login(client, new_user["email"]))
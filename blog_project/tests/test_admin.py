@@ -0,0 +1,141 @@
+from contextlib import closing
+import sqlite3
+import uuid
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from blog_project.db.session import build_engine, get_db
+from blog_project.main import app
+
+from tests.conftest import API, DB_PATH, PASSWORD, auth, login
+
+def create_posts(client, headers, count: int = 2, published: bool = True) -> list:
+    ids = []
+    for i in range(count):
+        response = client.post(
+            f"{API}/posts/", json={"title": f"Admin test {i}", "content": "x", "published": published}, headers=headers
+        )
+        assert response.status_code == 201
+        ids.append(response.json()["id"])
+    return ids
+
+def post_exists(client, post_id: int) -> bool:
+    return client.get(f"{API}/posts/{post_id}").status_code == 200
+
+@pytest.fixture
+def old_schema(client, tmp_path):
+    # Switches the app to a copy of the test database whose posts.author_id
+    # key is NO ACTION, as in databases created before the cascade
+    engines = []
+
+    def switch() -> str:
+        path = str(tmp_path / "old.db")
+        with closing(sqlite3.connect(DB_PATH)) as source, closing(sqlite3.connect(path)) as target:
+            source.backup(target)
+            create = target.execute("SELECT sql FROM sqlite_master WHERE name = 'posts'").fetchone()[0]
+            target.executescript(f"""
+                PRAGMA foreign_keys=OFF;
+                {create.replace("CREATE TABLE posts", "CREATE TABLE posts_no_cascade").replace(" ON DELETE CASCADE", "")};
+                INSERT INTO posts_no_cascade SELECT * FROM posts;
+                DROP TABLE posts;
+                ALTER TABLE posts_no_cascade RENAME TO posts;
+            """)
+        old_engine = build_engine(f"sqlite+aiosqlite:///{path}")
+        engines.append(old_engine)
+        sessions = async_sessionmaker(bind=old_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
+        async def get_old_db():
+            async with sessions() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = get_old_db
+        return path
+
+    yield switch
+    app.dependency_overrides.pop(get_db, None)
+    for old_engine in engines:
+        client.portal.call(old_engine.dispose)
+
+def test_delete_user_removes_their_posts(client, admin_headers, new_user, user_headers):
+    post_ids = create_posts(client, user_headers)
+    response = client.delete(f"{API}/admin/users/{new_user['id']}", headers=admin_headers)
+    assert response.status_code == 200
+    assert not any(post_exists(client, post_id) for post_id in post_ids)
+    assert client.delete(f"{API}/admin/users/{new_user['id']}", headers=admin_headers).status_code == 404
+
+def test_delete_user_works_without_the_cascade(client, admin_headers, new_user, user_headers, old_schema):
+    create_posts(client, user_headers)
+    path = old_schema()
+    response = client.delete(f"{API}/admin/users/{new_user['id']}", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    with closing(sqlite3.connect(path)) as conn:
+        assert conn.execute("SELECT count(*) FROM posts WHERE author_id = ?", (new_user["id"],)).fetchone() == (0,)
+        assert conn.execute("SELECT count(*) FROM users WHERE id = ?", (new_user["id"],)).fetchone() == (0,)
+
+def test_bulk_delete_users_works_without_the_cascade(client, admin_headers, new_user, user_headers, old_schema):
+    create_posts(client, user_headers)
+    path = old_schema()
+    response = client.post(f"{API}/admin/users/bulk-delete", json={"ids": [new_user["id"]]}, headers=admin_headers)
+    assert response.json() == {"affected": 1}
+    with closing(sqlite3.connect(path)) as conn:
+        assert conn.execute("SELECT count(*) FROM posts WHERE author_id = ?", (new_user["id"],)).fetchone() == (0,)
+
+@pytest.mark.parametrize("path", [
+    "users/bulk-delete",
+    "users/bulk-deactivate",
+    "posts/bulk-delete",
+    "posts/bulk-unpublish",
+])
+def test_bulk_operations_need_a_criterion(client, admin_headers, path):
+    assert client.post(f"{API}/admin/{path}", json={}, headers=admin_headers).status_code == 422
+
+def test_bulk_user_operations_skip_the_calling_admin(client, admin_headers):
+    admin_id = client.get(f"{API}/profile/me", headers=admin_headers).json()["id"]
+    for path in ("users/bulk-deactivate", "users/bulk-delete"):
+        response = client.post(f"{API}/admin/{path}", json={"ids": [admin_id]}, headers=admin_headers)
+        assert response.json() == {"affected": 0}
+    assert client.get(f"{API}/admin/users", headers=admin_headers).status_code == 200
+
+def signup(client) -> dict:
+    email = f"bulk-{uuid.uuid4().hex[:12]}@example.com"
+    user = client.post(f"{API}/users/", json={"email": email, "password": PASSWORD}).json()
+    return {**user, "headers": auth(login(client, email))}
+
+def test_bulk_delete_users(client, admin_headers):
+    first, second, kept = signup(client), signup(client), signup(client)
+    post_ids = create_posts(client, first["headers"]) + create_posts(client, second["headers"])
+    kept_post = create_posts(client, kept["headers"], 1)[0]
+    response = client.post(
+        f"{API}/admin/users/bulk-delete", json={"ids": [first["id"], second["id"]]}, headers=admin_headers
+    )
+    assert response.json() == {"affected": 2}
+    assert not any(post_exists(client, post_id) for post_id in post_ids)
+    assert post_exists(client, kept_post)
+    # Their tokens stop working at once
+    assert client.get(f"{API}/profile/me", headers=first["headers"]).status_code == 401
+
+def test_bulk_deactivate_counts_only_active_users(client, admin_headers):
+    first, second = signup(client), signup(client)
+    selection = {"ids": [first["id"], second["id"]], "is_active": True}
+    assert client.post(f"{API}/admin/users/bulk-deactivate", json=selection, headers=admin_headers).json() == {"affected": 2}
+    assert client.post(
+        f"{API}/admin/users/bulk-deactivate", json={"ids": [first["id"]]}, headers=admin_headers
+    ).json() == {"affected": 0}
+    assert client.get(f"{API}/profile/me", headers=first["headers"]).status_code == 401
+
+def test_bulk_post_operations(client, admin_headers):
+    author = signup(client)
+    published = create_posts(client, author["headers"], 3)
+    drafts = create_posts(client, author["headers"], 2, published=False)
+    selection = {"author_ids": [author["id"]], "published": False}
+    assert client.post(f"{API}/admin/posts/bulk-delete", json=selection, headers=admin_headers).json() == {"affected": 2}
+    remaining = {post["id"] for post in client.get(f"{API}/admin/posts", headers=admin_headers).json()}
+    assert not remaining & set(drafts)
+    assert set(published) <= remaining
+
+    selection = {"ids": published[:2]}
+    assert client.post(f"{API}/admin/posts/bulk-unpublish", json=selection, headers=admin_headers).json() == {"affected": 2}
+    # Already unpublished: nothing left to change
+    assert client.post(f"{API}/admin/posts/bulk-unpublish", json=selection, headers=admin_headers).json() == {"affected": 0}
+    assert client.get(f"{API}/posts/{published[0]}").json()["published"] is False
+    assert published[0] not in [post["id"] for post in client.get(f"{API}/posts/", params={"limit": 100}).json()["data"]]
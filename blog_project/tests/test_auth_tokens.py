@@ -0,0 +1,67 @@
+import time
+
+from tests.conftest import API, PASSWORD, auth, login, wait_for, write_as_other_worker
+
+NEW_PASSWORD = "N3wPassw0rd!"
+
+def refresh(client, tokens: dict):
+    return client.post(f"{API}/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+def me(client, tokens: dict) -> int:
+    return client.get(f"{API}/profile/me", headers=auth(tokens)).status_code
+
+def test_refresh_rotates_both_tokens(client, new_user):
+    tokens = login(client, new_user["email"])
+    response = refresh(client, tokens)
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert me(client, rotated) == 200
+    # The next refresh takes the rotated token
+    assert refresh(client, rotated).status_code == 200
+
+def test_replayed_refresh_token_revokes_the_family(client, new_user):
+    tokens = login(client, new_user["email"])
+    rotated = refresh(client, tokens).json()
+    # The used-up token comes back, e.g. stolen: the whole session ends
+    assert refresh(client, tokens).status_code == 401
+    assert refresh(client, rotated).status_code == 401
+    assert me(client, rotated) == 401
+    assert me(client, tokens) == 401
+    # Other sessions of the same user are untouched
+    assert me(client, login(client, new_user["email"])) == 200
+
+def test_logout_revokes_the_session(client, new_user):
+    tokens = login(client, new_user["email"])
+    other = login(client, new_user["email"])
+    response = client.post(f"{API}/auth/logout", headers=auth(tokens))
+    assert response.status_code == 200
+    assert me(client, tokens) == 401
+    assert refresh(client, tokens).status_code == 401
+    assert me(client, other) == 200
+
+def test_password_change_revokes_every_earlier_token(client, new_user):
+    tokens = login(client, new_user["email"])
+    other = login(client, new_user["email"])
+    response = client.put(
+        f"{API}/profile/change-password",
+        json={"old_password": PASSWORD, "new_password": NEW_PASSWORD},
+        headers=auth(tokens),
+    )
+    assert response.status_code == 200
+    for session in (tokens, other):
+        assert me(client, session) == 401
+        assert refresh(client, session).status_code == 401
+    assert client.post(
+        f"{API}/auth/login", data={"username": new_user["email"], "password": PASSWORD}
+    ).status_code == 401
+    assert me(client, login(client, new_user["email"], NEW_PASSWORD)) == 200
+
+def test_other_workers_revocations_are_picked_up(client, new_user):
+    tokens = login(client, new_user["email"])
+    assert me(client, tokens) == 200
+    write_as_other_worker((
+        "INSERT INTO token_revocations (family_id, user_id, revoked_at) VALUES (NULL, ?, ?)",
+        (new_user["id"], time.time()),
+    ))
+    assert wait_for(lambda: me(client, tokens) == 401)
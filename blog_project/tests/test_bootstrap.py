@@ -0,0 +1,36 @@
+import asyncio
+
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from blog_project.bootstrap import bootstrap
+from blog_project.db.base import Base
+
+def index_names(conn, table: str) -> set:
+    return {index["name"] for index in inspect(conn).get_indexes(table)}
+
+def test_bootstrap_adds_new_indexes_to_existing_tables(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+
+    async def run():
+        try:
+            async with engine.begin() as conn:
+                # A posts table from before the keyset indexes existed
+                await conn.run_sync(Base.metadata.create_all)
+                await conn.exec_driver_sql("DROP INDEX ix_posts_author_id_created_at_id")
+                await conn.exec_driver_sql("DROP INDEX ix_posts_published_created_at_id")
+            await bootstrap(engine)
+            # Running it again is a no-op
+            await bootstrap(engine)
+            async with engine.connect() as conn:
+                indexes = await conn.run_sync(index_names, "posts")
+                partial = await conn.scalar(
+                    text("SELECT sql FROM sqlite_master WHERE name = 'ix_posts_published_created_at_id'")
+                )
+        finally:
+            await engine.dispose()
+        return indexes, partial
+
+    indexes, partial = asyncio.run(run())
+    assert {"ix_posts_author_id_created_at_id", "ix_posts_published_created_at_id"} <= indexes
+    assert "WHERE" in partial
@@ -0,0 +1,39 @@
+from sqlalchemy.exc import OperationalError
+
+from blog_project.core.config import settings
+from blog_project.db import search
+
+from tests.conftest import API
+
+def test_failed_chunk_reports_its_items_and_later_chunks_still_insert(client, new_user, user_headers, monkeypatch):
+    index_posts = search.index_posts
+    calls = []
+
+    async def fail_first_chunk(db, rows):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise OperationalError("INSERT INTO posts_fts", {}, Exception("disk I/O error"))
+        await index_posts(db, rows)
+
+    monkeypatch.setattr(settings, "BULK_INSERT_CHUNK_SIZE", 3)
+    monkeypatch.setattr(search, "index_posts", fail_first_chunk)
+    body = [{"title": f"Chunked {i}", "content": "x"} for i in range(7)]
+    # The rollback after the first chunk expires current_user; the later
+    # chunks must not touch it again
+    response = client.post(f"{API}/posts/bulk", json=body, headers=user_headers)
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result["inserted"] == 4
+    assert [error["index"] for error in result["errors"]] == [0, 1, 2]
+    for post_id in result["ids"]:
+        assert client.get(f"{API}/posts/{post_id}").json()["author_id"] == new_user["id"]
+
+def test_overlong_title_is_rejected(client, user_headers):
+    response = client.post(f"{API}/posts/", json={"title": "x" * 201, "content": "x"}, headers=user_headers)
+    assert response.status_code == 422
+
+def test_overlong_title_is_a_per_item_bulk_error(client, user_headers):
+    body = [{"title": "x" * 201, "content": "x"}, {"title": "ok", "content": "x"}]
+    result = client.post(f"{API}/posts/bulk", json=body, headers=user_headers).json()
+    assert result["inserted"] == 1
+    assert [error["index"] for error in result["errors"]] == [0]
@@ -0,0 +1,50 @@
+import asyncio
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from blog_project.db.instrumentation import (
+    RequestQueryStats,
+    StatementStats,
+    current_query_stats,
+    instrument_engine,
+)
+from blog_project.db import instrumentation
+
+def test_failed_statements_leave_nothing_on_the_connection(monkeypatch):
+    stats = StatementStats()
+    monkeypatch.setattr(instrumentation, "statement_stats", stats)
+    # One pooled connection, so every statement runs on the same one
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    instrument_engine(engine)
+
+    async def run():
+        request_stats = RequestQueryStats()
+        token = current_query_stats.set(request_stats)
+        try:
+            for _ in range(3):
+                async with engine.connect() as conn:
+                    with pytest.raises(OperationalError):
+                        await conn.execute(text("SELECT * FROM missing_table"))
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                info = dict((await conn.get_raw_connection()).info)
+        finally:
+            current_query_stats.reset(token)
+            await engine.dispose()
+        return request_stats, info
+
+    request_stats, info = asyncio.run(run())
+    assert not any(isinstance(value, list) and value for value in info.values())
+    # Only the statement that completed is timed
+    assert request_stats.count == 1
+    assert [entry["statement"] for entry in stats.top()] == ["SELECT 1"]
+    assert stats.top()[0]["max_ms"] < 1000
+
+def test_statement_stats_fold_into_other_when_full():
+    stats = StatementStats(max_statements=2)
+    for statement in ("a", "b", "c", "d"):
+        stats.record(statement, 0.001)
+    assert {entry["statement"]: entry["count"] for entry in stats.top()} == {"a": 1, "b": 1, "<other>": 2}
@@ -0,0 +1,78 @@
+import json
+import logging
+import os
+import queue
+import sys
+
+from blog_project.core import logging_config
+from blog_project.core.logging_config import DroppingQueueHandler, JsonFormatter, SamplingFilter, parse_sampling
+
+def record(name: str = "blog_project.api", level: int = logging.INFO, msg: str = "hello %s", args=("world",), **extra):
+    return logging.makeLogRecord({
+        "name": name, "levelno": level, "levelname": logging.getLevelName(level), "msg": msg, "args": args, **extra
+    })
+
+def test_json_formatter_emits_extra_fields_and_exceptions():
+    entry = json.loads(JsonFormatter().format(record(request_id="abc", status=201, _private=1)))
+    assert entry["message"] == "hello world"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "blog_project.api"
+    assert entry["request_id"] == "abc" and entry["status"] == 201
+    assert "_private" not in entry and "args" not in entry
+    assert entry["ts"].endswith("Z") and "T" in entry["ts"]
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        failed = record(level=logging.ERROR, exc_info=sys.exc_info())
+    entry = json.loads(JsonFormatter().format(failed))
+    assert "ValueError: boom" in entry["exc"]
+
+def test_parse_sampling():
+    assert parse_sampling(" blog_project.api=0.1, uvicorn.access=0 ,junk,") == {
+        "blog_project.api": 0.1, "uvicorn.access": 0.0
+    }
+    assert parse_sampling("") == {}
+
+def test_sampling_uses_the_longest_prefix_and_keeps_warnings():
+    sampler = SamplingFilter({"uvicorn": 1.0, "uvicorn.access": 0.0, "blog_project": 0.5})
+    assert not sampler.filter(record("uvicorn.access"))
+    assert sampler.filter(record("uvicorn.error"))
+    assert sampler.filter(record("other"))
+    assert sampler.filter(record("uvicorn.access", logging.WARNING))
+    kept = sum(sampler.filter(record("blog_project.db")) for _ in range(2000))
+    assert 800 < kept < 1200
+
+def test_full_queue_drops_and_reports_the_count():
+    log_queue: queue.Queue = queue.Queue(maxsize=2)
+    handler = DroppingQueueHandler(log_queue)
+    for _ in range(5):
+        handler.emit(record())
+    assert log_queue.qsize() == 2
+    assert handler.dropped == 3
+
+    log_queue.get_nowait()
+    log_queue.get_nowait()
+    handler.emit(record(msg="after", args=()))
+    queued = [log_queue.get_nowait() for _ in range(log_queue.qsize())]
+    assert [r.getMessage() for r in queued] == ["after", "Dropped 3 log records, queue full"]
+    assert queued[1].levelno == logging.WARNING
+    assert (handler.dropped, handler.dropped_total) == (0, 3)
+
+def test_forked_child_logs_before_setup(tmp_path, monkeypatch):
+    # Records a worker logs before lifespan startup reach the output
+    path = tmp_path / "child.log"
+    output = logging.FileHandler(path)
+    output.setFormatter(logging.Formatter("%(message)s"))
+    monkeypatch.setattr(logging_config._listener, "handlers", (output,))
+    pid = os.fork()
+    if pid == 0:
+        try:
+            logging.getLogger("blog_project.test").warning("from the child %s", os.getpid())
+            logging_config.shutdown_logging()
+        finally:
+            os._exit(0)
+    _, status = os.waitpid(pid, 0)
+    output.close()
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert path.read_text().splitlines() == [f"from the child {pid}"]
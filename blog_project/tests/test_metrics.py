@@ -0,0 +1,60 @@
+import json
+import os
+
+from blog_project.core import metrics
+from blog_project.core.config import settings
+from blog_project.core.metrics import MetricsRegistry, clear_snapshots, collect, retire_snapshot
+
+from tests.conftest import API
+
+def sample(route: str = "/api/v1/posts/{post_id}", count: int = 1, status: str = "200") -> dict:
+    buckets = [0] * (len(metrics.LATENCY_BUCKETS) + 1)
+    buckets[0] = count
+    return {f"GET {route}": {"buckets": buckets, "count": count, "sum": 0.001 * count, "statuses": {status: count}}}
+
+def write(directory, name: str, snapshot: dict) -> None:
+    with open(os.path.join(directory, name), "w") as f:
+        json.dump(snapshot, f)
+
+def test_requests_are_labelled_by_route_template(client, user_headers):
+    post = client.post(f"{API}/posts/", json={"title": "Metrics", "content": "x"}, headers=user_headers).json()
+    for post_id in (post["id"], post["id"], 999999999):
+        client.get(f"{API}/posts/{post_id}")
+    body = client.get("/metrics").text
+    assert 'http_requests_total{method="GET",route="/api/v1/posts/{post_id}",status="200"}' in body
+    assert 'http_requests_total{method="GET",route="/api/v1/posts/{post_id}",status="404"}' in body
+    assert f"/posts/{post['id']}\"" not in body
+    assert "999999999" not in body
+
+def test_collect_sums_every_workers_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+    registry = MetricsRegistry()
+    registry.observe("GET", "/api/v1/posts/{post_id}", 200, 0.001)
+    # This worker's own file is stale; its live registry counts instead
+    write(tmp_path, f"metrics-{os.getpid()}.json", sample(count=100))
+    write(tmp_path, "metrics-1001.json", sample(count=2))
+    write(tmp_path, "metrics-1002.json", sample(count=3, status="404"))
+    write(tmp_path, "metrics-1003.json.tmp", sample(count=100))
+    merged = collect(registry)["GET /api/v1/posts/{post_id}"]
+    assert merged["count"] == 6
+    assert merged["statuses"] == {"200": 3, "404": 3}
+    assert merged["buckets"][0] == 6
+
+def test_exited_workers_are_folded_into_one_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+    write(tmp_path, "metrics-1001.json", sample(count=2))
+    write(tmp_path, "metrics-1002.json", sample(count=3))
+    retire_snapshot(1001)
+    retire_snapshot(1002)
+    # A worker that never wrote a snapshot
+    retire_snapshot(1003)
+    assert sorted(os.listdir(tmp_path)) == ["metrics-retired.json"]
+    assert collect(MetricsRegistry())["GET /api/v1/posts/{post_id}"]["count"] == 5
+
+def test_master_startup_clears_old_snapshots(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+    for name in ("metrics-1001.json", "metrics-retired.json", "metrics-1002.json.tmp", "unrelated.txt"):
+        write(tmp_path, name, sample())
+    clear_snapshots()
+    assert os.listdir(tmp_path) == ["unrelated.txt"]
+    assert collect(MetricsRegistry()) == {}
@@ -0,0 +1,87 @@
+from datetime import datetime
+import pytest
+
+from blog_project.core.pagination import decode_cursor, encode_cursor
+
+from tests.conftest import API
+
+@pytest.fixture
+def author_posts(client, new_user, user_headers):
+    # Bulk inserts share one created_at per chunk, so ordering within the
+    # batch rests on the id tie-breaker
+    body = [{"title": f"Post {i}", "content": f"Body {i}"} for i in range(23)]
+    response = client.post(f"{API}/posts/bulk", json=body, headers=user_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["inserted"] == 23
+    return new_user, response.json()["ids"]
+
+def offset_ids(client) -> list:
+    ids, skip = [], 0
+    while True:
+        page = client.get(f"{API}/posts/", params={"skip": skip, "limit": 100}).json()
+        ids += [post["id"] for post in page["data"]]
+        if len(page["data"]) < 100:
+            return ids
+        skip += 100
+
+def walk(client, path: str, limit: int) -> list:
+    pages, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(path, params=params)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        pages.append(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 3, 1, 12, 30, 5, 123456)
+    cursor = decode_cursor(encode_cursor(created_at, 42, "prev"))
+    assert (cursor.created_at, cursor.id, cursor.direction) == (created_at, 42, "prev")
+
+def test_cursor_walk_matches_offset_order(client, author_posts):
+    expected = offset_ids(client)
+    pages = walk(client, f"{API}/posts/", limit=7)
+    walked = [post["id"] for page in pages for post in page["data"]]
+    assert walked == expected
+    assert len(set(walked)) == len(walked)
+    assert all(len(page["data"]) == 7 for page in pages[:-1])
+    assert pages[0]["prev_cursor"] is None
+
+def test_prev_cursor_returns_previous_page(client, author_posts):
+    first = client.get(f"{API}/posts/", params={"limit": 5}).json()
+    second = client.get(f"{API}/posts/", params={"limit": 5, "cursor": first["next_cursor"]}).json()
+    back = client.get(f"{API}/posts/", params={"limit": 5, "cursor": second["prev_cursor"]}).json()
+    assert [post["id"] for post in back["data"]] == [post["id"] for post in first["data"]]
+    assert back["next_cursor"] is not None
+
+def test_author_feed_walks_only_that_author(client, author_posts):
+    user, ids = author_posts
+    pages = walk(client, f"{API}/users/{user['id']}/posts", limit=10)
+    walked = [post["id"] for page in pages for post in page["data"]]
+    assert walked == sorted(ids, reverse=True)
+    assert {post["author_id"] for page in pages for post in page["data"]} == {user["id"]}
+
+def test_unpublished_posts_are_not_listed(client, user_headers):
+    response = client.post(f"{API}/posts/", json={"title": "Draft", "content": "x", "published": False}, headers=user_headers)
+    assert response.status_code == 201
+    assert response.json()["id"] not in offset_ids(client)
+
+@pytest.mark.parametrize("params", [
+    {"limit": -5},
+    {"limit": 0},
+    {"limit": 101},
+    {"skip": -1},
+])
+def test_out_of_range_paging_is_rejected(client, params):
+    assert client.get(f"{API}/posts/", params=params).status_code == 422
+
+def test_skip_with_cursor_is_rejected(client, author_posts):
+    cursor = client.get(f"{API}/posts/", params={"limit": 2}).json()["next_cursor"]
+    response = client.get(f"{API}/posts/", params={"skip": 4, "cursor": cursor})
+    assert response.status_code == 400
+
+def test_malformed_cursor_is_rejected(client):
+    assert client.get(f"{API}/posts/", params={"cursor": "not-a-cursor"}).status_code == 400
@@ -0,0 +1,42 @@
+import time
+
+from blog_project.core.response_cache import post_cache
+
+from tests.conftest import API, wait_for, write_as_other_worker
+
+def create_post(client, headers) -> dict:
+    response = client.post(f"{API}/posts/", json={"title": "Cached", "content": "v1"}, headers=headers)
+    assert response.status_code == 201
+    return response.json()
+
+def test_other_workers_writes_clear_the_cache(client, user_headers):
+    post = create_post(client, user_headers)
+    assert client.get(f"{API}/posts/{post['id']}").json()["content"] == "v1"
+
+    write_as_other_worker(("UPDATE posts SET content = 'v2' WHERE id = ?", (post["id"],)))
+    # Still served from this worker's cache: nothing told it about the write
+    assert client.get(f"{API}/posts/{post['id']}").json()["content"] == "v1"
+
+    write_as_other_worker((
+        "INSERT INTO post_invalidations (post_id, invalidated_at) VALUES (?, ?)",
+        (post["id"], time.time()),
+    ))
+    assert wait_for(lambda: client.get(f"{API}/posts/{post['id']}").json()["content"] == "v2")
+
+def test_clear_all_row_empties_both_caches(client, user_headers):
+    post = create_post(client, user_headers)
+    client.get(f"{API}/posts/{post['id']}")
+    write_as_other_worker(("INSERT INTO post_invalidations (post_id, invalidated_at) VALUES (NULL, ?)", (time.time(),)))
+    assert wait_for(lambda: post_cache.get(post["id"]) is None)
+
+def test_own_writes_are_not_replayed(client, user_headers):
+    post = create_post(client, user_headers)
+    response = client.put(
+        f"{API}/posts/{post['id']}", json={"title": "Cached", "content": "v3"}, headers=user_headers
+    )
+    assert response.status_code == 200
+    assert client.get(f"{API}/posts/{post['id']}").json()["content"] == "v3"
+    # The writer cleared its caches after the commit; re-reading its own row
+    # in later syncs must not keep evicting the fresh entry
+    time.sleep(1)
+    assert post_cache.get(post["id"]) is not None
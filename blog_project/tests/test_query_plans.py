@@ -0,0 +1,107 @@
+import asyncio
+import os
+import re
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from blog_project.api.routes import popular_posts_query, posts_page_query
+from blog_project.core.pagination import Cursor
+from blog_project.db.base import Base
+from blog_project.models.models import Post, PostView, User, UserRole
+
+# The listing, author feed, popular and single-post queries must walk the
+# index meant for them: no full scan of these tables and no sort step.
+# Checked against a seeded SQLite file by default; set
+# QUERY_PLANS_DATABASE_URL to a scratch Postgres database to check real
+# plans there (its tables are dropped).
+POSTS = 20000
+AUTHORS = 200
+TABLES = ("posts", "post_views")
+
+LISTING_INDEX = "ix_posts_published_created_at_id"
+AUTHOR_INDEX = "ix_posts_author_id_created_at_id"
+
+def statements() -> dict:
+    # name -> (statement, index its plan must use; None for primary key lookups)
+    # Cursor positions from the middle of the data, like a deep page
+    middle = Cursor(datetime.utcnow(), POSTS // 2)
+    author = Post.author_id == 1 + AUTHORS // 2
+    return {
+        "listing, first page": (posts_page_query(None, 0, 10), LISTING_INDEX),
+        "listing, offset": (posts_page_query(None, 500, 10), LISTING_INDEX),
+        "listing, next cursor": (posts_page_query(middle, 0, 10), LISTING_INDEX),
+        "listing, prev cursor": (posts_page_query(middle._replace(direction="prev"), 0, 10), LISTING_INDEX),
+        "author feed, first page": (posts_page_query(None, 0, 10, author), AUTHOR_INDEX),
+        "author feed, next cursor": (posts_page_query(middle, 0, 10, author), AUTHOR_INDEX),
+        "author feed, prev cursor": (posts_page_query(middle._replace(direction="prev"), 0, 10, author), AUTHOR_INDEX),
+        "popular": (popular_posts_query(10), "ix_post_views_views_post_id"),
+        "single post": (select(Post).where(Post.id == POSTS // 2), None),
+    }
+
+async def explain(conn, statement) -> tuple:
+    # (plan lines, problems)
+    sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "sqlite":
+        rows = (await conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql)).all()
+        lines = [row[-1] for row in rows]
+        problems = [
+            line for line in lines
+            if re.fullmatch(r"SCAN (%s)" % "|".join(TABLES), line) or "TEMP B-TREE" in line
+        ]
+        return lines, problems
+
+    plan = (await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + sql)).scalar()[0]["Plan"]
+    lines, problems = [], []
+
+    def walk(node, depth):
+        line = "  " * depth + node["Node Type"] + (" on " + node["Relation Name"] if "Relation Name" in node else "")
+        if "Index Name" in node:
+            line += " using INDEX " + node["Index Name"]
+        lines.append(line)
+        if node["Node Type"] == "Sort" or (node["Node Type"] == "Seq Scan" and node.get("Relation Name") in TABLES):
+            problems.append(line.strip())
+        for child in node.get("Plans", ()):
+            walk(child, depth + 1)
+
+    walk(plan, 0)
+    return lines, problems
+
+async def seed_and_explain(url: str) -> dict:
+    # Every fifth post a draft, every post with a view count
+    engine = create_async_engine(url)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(User), [
+                {"email": f"user{i}@example.com", "password_hash": "x", "is_active": True, "role": UserRole.USER}
+                for i in range(AUTHORS)
+            ])
+            await conn.execute(insert(Post), [
+                {"title": f"Post {i}", "content": "Lorem ipsum", "published": i % 5 != 0, "author_id": 1 + i % AUTHORS}
+                for i in range(POSTS)
+            ])
+            await conn.execute(insert(PostView).from_select(["post_id", "views"], select(Post.id, Post.id % 1000)))
+        async with engine.connect() as conn:
+            await conn.execute(text("ANALYZE"))
+            await conn.commit()
+            return {name: await explain(conn, statement) for name, (statement, _) in statements().items()}
+    finally:
+        await engine.dispose()
+
+@pytest.fixture(scope="module")
+def plans(tmp_path_factory):
+    url = os.environ.get("QUERY_PLANS_DATABASE_URL") or (
+        f"sqlite+aiosqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}"
+    )
+    return asyncio.run(seed_and_explain(url))
+
+@pytest.mark.parametrize("name, index", [(name, index) for name, (_, index) in statements().items()])
+def test_query_walks_its_index(plans, name, index):
+    lines, problems = plans[name]
+    assert not problems, "\n".join(lines)
+    if index is not None:
+        assert any(re.search(r"INDEX %s\b" % index, line) for line in lines), "\n".join(lines)
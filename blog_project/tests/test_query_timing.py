@@ -0,0 +1,21 @@
+import pytest
+
+from blog_project.core.config import Settings
+
+from tests.conftest import API
+
+@pytest.mark.parametrize("environment, override, expected", [
+    ("development", None, True),
+    ("production", None, False),
+    ("staging", None, False),
+    ("production", True, True),
+    ("development", False, False),
+])
+def test_query_timing_defaults_to_development_only(environment, override, expected):
+    config = Settings(ENVIRONMENT=environment, QUERY_TIMING_ENABLED=override)
+    assert config.get_query_timing_enabled is expected
+
+def test_server_timing_reports_queries(client):
+    timing = client.get(f"{API}/posts/", params={"limit": 1}).headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert "queries" in timing
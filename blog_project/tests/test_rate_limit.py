@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+
+from blog_project.core.rate_limit import (
+    MemoryBackend,
+    RateLimitBackend,
+    RateLimiter,
+    RateLimitMiddleware,
+    SharedMemoryBackend,
+)
+
+WINDOW = 60
+LIMIT = 10
+# Start of a fixed window, so offsets below are positions within it
+T0 = 1_700_000_040.0
+
+def hits(backend: RateLimitBackend, key: str, count: int, now: float) -> list:
+    async def run():
+        return [await backend.hit(key, LIMIT, WINDOW, now) for _ in range(count)]
+    return asyncio.run(run())
+
+def allowed(results: list) -> int:
+    return sum(1 for ok, _ in results if ok)
+
+@pytest.fixture(params=["memory", "shared"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend()
+    return SharedMemoryBackend(str(tmp_path / "rate_limit"), slots=64)
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        RateLimitBackend()
+
+def test_limit_within_one_window(backend):
+    results = hits(backend, "a", LIMIT + 3, T0 + 5)
+    assert allowed(results) == LIMIT
+    assert all(not ok for ok, _ in results[LIMIT:])
+    # Blocked until the fixed window rolls over
+    assert results[-1][1] == WINDOW - 5 + 1
+
+def test_previous_window_is_weighted_by_overlap(backend):
+    assert allowed(hits(backend, "a", LIMIT, T0 + 59)) == LIMIT
+    # At the very start of the next window the full previous count still
+    # overlaps the sliding window
+    assert allowed(hits(backend, "a", 1, T0 + WINDOW)) == 0
+    # Halfway through, half of it does: estimate 5 leaves room for 5 more
+    assert allowed(hits(backend, "a", LIMIT, T0 + WINDOW + 30)) == LIMIT // 2
+
+def test_counts_expire_after_two_windows(backend):
+    hits(backend, "a", LIMIT, T0 + 10)
+    assert allowed(hits(backend, "a", LIMIT + 1, T0 + 2 * WINDOW + 1)) == LIMIT
+
+def test_clients_are_counted_separately(backend):
+    hits(backend, "a", LIMIT, T0)
+    assert allowed(hits(backend, "b", 1, T0)) == 1
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_clients=2)
+    hits(backend, "a", LIMIT, T0)
+    hits(backend, "b", 1, T0)
+    hits(backend, "a", 1, T0)
+    hits(backend, "c", 1, T0)
+    assert list(backend._clients) == ["a", "c"]
+    assert allowed(hits(backend, "a", 1, T0)) == 0
+
+def test_shared_backend_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "rate_limit")
+    first, second = SharedMemoryBackend(path, slots=64), SharedMemoryBackend(path, slots=64)
+    hits(first, "a", LIMIT - 1, T0)
+    assert allowed(hits(second, "a", 2, T0)) == 1
+
+def call(middleware: RateLimitMiddleware, path: str) -> int:
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "path": path, "method": "GET", "headers": [], "client": ("10.0.0.1", 1234)}
+    asyncio.run(middleware(scope, receive, send))
+    return sent[0]["status"]
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+def test_middleware_exempts_health_and_metrics():
+    middleware = RateLimitMiddleware(ok_app, RateLimiter(requests=2, window=WINDOW))
+    assert [call(middleware, "/api/v1/posts/") for _ in range(3)] == [200, 200, 429]
+    assert call(middleware, "/metrics") == 200
+    assert call(middleware, "/health") == 200
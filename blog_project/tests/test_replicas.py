@@ -0,0 +1,119 @@
+import asyncio
+import pytest
+import time
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from blog_project.api.routes import FULL_FIELDS
+from blog_project.core.config import settings
+from blog_project.core.read_your_writes import ReadYourWritesMiddleware
+from blog_project.core.response_cache import invalidate_all_posts, post_cache, post_list_cache
+from blog_project.db import session as session_module
+from blog_project.db.base import Base
+from blog_project.db.session import READ_PIN_COOKIE, ReplicaSet
+from blog_project.models.models import Post, User, UserRole
+
+from tests.conftest import API
+
+# Only on the replica file, so reads that return it came from there
+REPLICA_POST_ID = 900001
+
+def seed_replica(url: str) -> None:
+    async def run():
+        engine = create_async_engine(url)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(User).values(
+                id=1, email="replica@example.com", password_hash="x", is_active=True, role=UserRole.USER
+            ))
+            await conn.execute(insert(Post).values(
+                id=REPLICA_POST_ID, title="From the replica", content="x", published=True, author_id=1
+            ))
+        await engine.dispose()
+    asyncio.run(run())
+
+@pytest.fixture
+def use_replicas(client, monkeypatch):
+    # Points get_read_db at a ReplicaSet over the given URLs for one test
+    created = []
+
+    def use(*urls: str) -> ReplicaSet:
+        replica_set = ReplicaSet(list(urls))
+        created.append(replica_set)
+        monkeypatch.setattr(session_module, "replicas", replica_set)
+        return replica_set
+
+    invalidate_all_posts()
+    yield use
+    invalidate_all_posts()
+    for replica_set in created:
+        for replica_engine in replica_set.engines:
+            client.portal.call(replica_engine.dispose)
+
+@pytest.fixture
+def replica(tmp_path, use_replicas) -> ReplicaSet:
+    url = f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"
+    seed_replica(url)
+    return use_replicas(url)
+
+def test_reads_go_to_the_replica(client, replica):
+    response = client.get(f"{API}/posts/{REPLICA_POST_ID}")
+    assert response.status_code == 200
+    assert response.json()["title"] == "From the replica"
+    page = client.get(f"{API}/posts/", params={"limit": 5}).json()
+    assert [post["id"] for post in page["data"]] == [REPLICA_POST_ID]
+
+def test_pinned_client_reads_from_the_primary(client, replica):
+    pinned = {"Cookie": f"{READ_PIN_COOKIE}=1"}
+    assert client.get(f"{API}/posts/{REPLICA_POST_ID}", headers=pinned).status_code == 404
+    page = client.get(f"{API}/posts/", params={"limit": 5}, headers=pinned).json()
+    assert REPLICA_POST_ID not in [post["id"] for post in page["data"]]
+
+def test_unreachable_replica_falls_back_to_the_primary(client, user_headers, tmp_path, use_replicas):
+    post = client.post(f"{API}/posts/", json={"title": "On the primary", "content": "x"}, headers=user_headers).json()
+    replica_set = use_replicas(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    response = client.get(f"{API}/posts/{post['id']}")
+    assert response.status_code == 200
+    assert response.json()["title"] == "On the primary"
+    assert replica_set.status()[0]["healthy"] is False
+
+def call(middleware: ReadYourWritesMiddleware, method: str, status: int) -> list:
+    sent = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    middleware.app = app
+    asyncio.run(middleware({"type": "http", "method": method, "path": "/"}, receive, send))
+    return [value for name, value in sent[0]["headers"] if name == b"set-cookie"]
+
+def test_successful_writes_set_the_pin_cookie():
+    middleware = ReadYourWritesMiddleware(None, seconds=5)
+    assert call(middleware, "POST", 201) == [f"{READ_PIN_COOKIE}=1; Max-Age=5; Path=/; HttpOnly; SameSite=Lax".encode()]
+    assert call(middleware, "DELETE", 200) != []
+    assert call(middleware, "GET", 200) == []
+    assert call(middleware, "POST", 422) == []
+
+def expires_in(cache, key) -> float:
+    return cache._data[key][0] - time.monotonic()
+
+def test_replica_reads_are_cached_only_for_the_pin_window(client, replica, monkeypatch):
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 0.3)
+    client.get(f"{API}/posts/{REPLICA_POST_ID}")
+    client.get(f"{API}/posts/", params={"limit": 5})
+    assert expires_in(post_cache, REPLICA_POST_ID) <= 0.3
+    assert expires_in(post_list_cache, (0, 5, None, FULL_FIELDS)) <= 0.3
+    time.sleep(0.4)
+    assert post_cache.get(REPLICA_POST_ID) is None
+
+def test_primary_reads_keep_the_full_ttl(client, user_headers):
+    post = client.post(f"{API}/posts/", json={"title": "Primary", "content": "x"}, headers=user_headers).json()
+    client.get(f"{API}/posts/{post['id']}")
+    assert expires_in(post_cache, post["id"]) > settings.POST_CACHE_TTL_SECONDS - 5
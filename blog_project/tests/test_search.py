@@ -0,0 +1,111 @@
+from contextlib import closing
+import sqlite3
+import uuid
+import pytest
+
+from blog_project.db.search import _fts5_query
+
+from tests.conftest import API, DB_PATH
+
+def unique_word() -> str:
+    # One token that no other test's posts contain
+    return "zq" + uuid.uuid4().hex[:10]
+
+def search(client, q: str, **params) -> dict:
+    response = client.get(f"{API}/posts/search", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def found(client, q: str) -> list:
+    return [post["id"] for post in search(client, q, limit=100)["data"]]
+
+def fts_rows(post_ids) -> dict:
+    with closing(sqlite3.connect(DB_PATH)) as conn:
+        marks = ",".join("?" * len(post_ids))
+        return dict(conn.execute(f"SELECT rowid, content FROM posts_fts WHERE rowid IN ({marks})", list(post_ids)))
+
+def create_post(client, headers, title: str, content: str, published: bool = True) -> int:
+    response = client.post(
+        f"{API}/posts/", json={"title": title, "content": content, "published": published}, headers=headers
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+@pytest.mark.parametrize("q, expected", [
+    ("fast api", '"fast" "api"'),
+    ('title:secret OR NEAR(a b) "x*', '"title" "secret" "OR" "NEAR" "a" "b" "x"'),
+    ("-(*)^", None),
+    ("", None),
+])
+def test_fts5_query_quotes_every_term(q, expected):
+    assert _fts5_query(q) == expected
+
+@pytest.mark.parametrize("q", ['"', "NEAR(", "a OR", "title:*", "-(*)^"])
+def test_operator_input_is_matched_literally(client, q):
+    search(client, q)
+
+def test_title_matches_rank_first_and_drafts_are_hidden(client, user_headers):
+    word = unique_word()
+    in_content = create_post(client, user_headers, "Other", f"about {word} here")
+    in_title = create_post(client, user_headers, f"All about {word}", "body")
+    create_post(client, user_headers, word, word, published=False)
+    assert found(client, word) == [in_title, in_content]
+
+def test_search_index_follows_post_writes(client, user_headers):
+    old, new = unique_word(), unique_word()
+    post_id = create_post(client, user_headers, "Searchable", old)
+    assert fts_rows([post_id]) == {post_id: old}
+    assert found(client, old) == [post_id]
+
+    response = client.put(f"{API}/posts/{post_id}", json={"title": "Searchable", "content": new}, headers=user_headers)
+    assert response.status_code == 200
+    assert fts_rows([post_id]) == {post_id: new}
+    assert found(client, old) == []
+    assert found(client, new) == [post_id]
+
+    assert client.delete(f"{API}/posts/{post_id}", headers=user_headers).status_code == 200
+    assert fts_rows([post_id]) == {}
+    assert found(client, new) == []
+
+def test_bulk_create_indexes_every_post(client, user_headers):
+    word = unique_word()
+    body = [{"title": f"Bulk {i}", "content": word} for i in range(5)]
+    ids = client.post(f"{API}/posts/bulk", json=body, headers=user_headers).json()["ids"]
+    assert set(fts_rows(ids)) == set(ids)
+    assert sorted(found(client, word)) == sorted(ids)
+
+@pytest.mark.parametrize("path, selection", [
+    ("posts/bulk-delete", lambda user, ids: {"ids": ids}),
+    ("posts/bulk-delete", lambda user, ids: {"author_ids": [user["id"]]}),
+    ("users/bulk-delete", lambda user, ids: {"ids": [user["id"]]}),
+])
+def test_admin_bulk_deletes_drop_index_rows(client, admin_headers, new_user, user_headers, path, selection):
+    word = unique_word()
+    ids = [create_post(client, user_headers, f"Doomed {i}", word) for i in range(3)]
+    response = client.post(f"{API}/admin/{path}", json=selection(new_user, ids), headers=admin_headers)
+    assert response.status_code == 200
+    assert fts_rows(ids) == {}
+    assert found(client, word) == []
+
+def test_admin_delete_user_drops_index_rows(client, admin_headers, new_user, user_headers):
+    ids = [create_post(client, user_headers, f"Doomed {i}", unique_word()) for i in range(2)]
+    assert client.delete(f"{API}/admin/users/{new_user['id']}", headers=admin_headers).status_code == 200
+    assert fts_rows(ids) == {}
+
+def test_rank_cursor_walks_every_match_once(client, user_headers):
+    word = unique_word()
+    # Equal scores among the repeated bodies exercise the id tie-breaker
+    ids = [create_post(client, user_headers, "Ranked", f"{word} " * (1 + i % 3)) for i in range(8)]
+    walked, cursor = [], None
+    while True:
+        page = search(client, word, limit=3, **({"cursor": cursor} if cursor else {}))
+        walked += [post["id"] for post in page["data"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(walked) == sorted(ids)
+    assert walked == found(client, word)
+
+def test_malformed_rank_cursor_is_rejected(client):
+    response = client.get(f"{API}/posts/search", params={"q": "x", "cursor": "not-a-cursor"})
+    assert response.status_code == 400
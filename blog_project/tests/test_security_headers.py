@@ -0,0 +1,72 @@
+import asyncio
+import re
+import pytest
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+
+from blog_project.core import security_headers
+from blog_project.core.security_headers import (
+    DOCS_CONTENT_SECURITY_POLICY,
+    SECURITY_HEADER_PROFILES,
+    SecurityHeadersMiddleware,
+    build_header_block,
+)
+
+def response_headers(middleware: SecurityHeadersMiddleware, path: str) -> dict:
+    sent = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    middleware.app = app
+    asyncio.run(middleware({"type": "http", "method": "GET", "path": path}, receive, send))
+    return {name.decode(): value.decode() for name, value in sent[0]["headers"]}
+
+@pytest.mark.parametrize("profile", list(SECURITY_HEADER_PROFILES))
+def test_api_responses_carry_the_profile_headers(profile):
+    headers = response_headers(SecurityHeadersMiddleware(None, profile), "/api/v1/posts/")
+    assert headers == {name.lower(): value for name, value in SECURITY_HEADER_PROFILES[profile].items()}
+
+def test_strict_api_policy_is_self_only():
+    headers = response_headers(SecurityHeadersMiddleware(None, "strict"), "/api/v1/posts/")
+    assert headers["content-security-policy"] == "default-src 'self'"
+    assert "strict-transport-security" in headers
+
+@pytest.mark.parametrize("path", ["/docs", "/docs/oauth2-redirect", "/redoc"])
+def test_strict_docs_pages_allow_their_cdn_assets(path):
+    headers = response_headers(SecurityHeadersMiddleware(None, "strict"), path)
+    assert headers["content-security-policy"] == DOCS_CONTENT_SECURITY_POLICY
+    # Everything else stays as strict as on the API
+    expected = {name.lower(): value for name, value in SECURITY_HEADER_PROFILES["strict"].items()}
+    assert {**headers, "content-security-policy": "default-src 'self'"} == expected
+
+@pytest.mark.parametrize("profile", ["off", "basic"])
+def test_docs_pages_are_unchanged_without_a_policy(profile):
+    middleware = SecurityHeadersMiddleware(None, profile)
+    assert response_headers(middleware, "/docs") == response_headers(middleware, "/api/v1/posts/")
+
+def test_docs_policy_covers_the_pages_fastapi_renders():
+    html = "".join(
+        page.body.decode()
+        for page in (get_swagger_ui_html(openapi_url="/openapi.json", title="x"), get_redoc_html(openapi_url="/openapi.json", title="x"))
+    )
+    hosts = set(re.findall(r'(?:src|href)="(https://[^/"]+)', html))
+    assert hosts
+    for host in hosts:
+        assert host in DOCS_CONTENT_SECURITY_POLICY
+
+@pytest.mark.parametrize("environment, expected", [("production", "strict"), ("development", "off")])
+def test_profile_defaults_to_the_environment(monkeypatch, environment, expected):
+    monkeypatch.setattr(security_headers.settings, "SECURITY_HEADERS_PROFILE", "")
+    monkeypatch.setattr(security_headers.settings, "ENVIRONMENT", environment)
+    assert SecurityHeadersMiddleware(None).raw_headers == build_header_block(expected)
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        build_header_block("paranoid")
@@ -0,0 +1,55 @@
+import asyncio
+import pytest
+
+from blog_project.core import view_counter as view_counter_module
+from blog_project.core.view_counter import ViewCounter
+
+def test_cancelled_flush_keeps_its_counts(monkeypatch):
+    writing = asyncio.Event()
+
+    async def hanging_upsert(db, counts):
+        writing.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(view_counter_module, "upsert_view_counts", hanging_upsert)
+    counter = ViewCounter()
+
+    async def run():
+        counter.record(1)
+        counter.record(1)
+        flush = asyncio.create_task(counter.flush())
+        await writing.wait()
+        counter.record(2)
+        flush.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flush
+
+    asyncio.run(run())
+    assert counter.pending == {1: 2, 2: 1}
+    assert counter.flushed_total == 0
+
+def test_stopping_lets_a_flush_in_progress_finish(monkeypatch):
+    written = []
+    writing = asyncio.Event()
+
+    async def slow_upsert(db, counts):
+        writing.set()
+        await asyncio.sleep(0.1)
+        written.append(dict(counts))
+
+    monkeypatch.setattr(view_counter_module, "upsert_view_counts", slow_upsert)
+    monkeypatch.setattr(view_counter_module.settings, "VIEW_FLUSH_INTERVAL_SECONDS", 0.01)
+    counter = ViewCounter()
+
+    async def run():
+        stopping = asyncio.Event()
+        counter.record(7)
+        flusher = asyncio.create_task(counter.run(stopping))
+        await writing.wait()
+        stopping.set()
+        await asyncio.wait_for(flusher, 5)
+
+    asyncio.run(run())
+    assert written == [{7: 1}]
+    assert counter.pending == {}
+    assert counter.flushed_total == 1